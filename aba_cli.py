@@ -0,0 +1,187 @@
+"""
+Evaluation en masse de fichiers de cadres ABA, en ligne de commande
+
+Le pipeline est celui des routes de l'application (voir aba_core.OPERATIONS)
+mais n'importe pas Flask : les processus de calcul démarrent rapidement.
+
+Exemples :
+    python aba_cli.py cadres/ --output resultats.jsonl
+    python aba_cli.py 'cadres/**/*.aba' --output-dir resultats/ --workers 8
+    python aba_cli.py exemple.aba --non-circular scc --semantics grounded,preferred
+    python aba_cli.py cadres/ --claim p
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aba_core
+from aba_core import OPERATIONS
+
+
+def collect_inputs(patterns, extension='.aba'):
+    """
+    Retourne les fichiers désignés par une liste de chemins : fichiers,
+    répertoires (parcourus récursivement, fichiers d'extension extension)
+    ou motifs glob ('**' pour les sous-répertoires), sans doublon
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, directories, names in os.walk(pattern):
+                directories.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(extension))
+        elif glob.has_magic(pattern):
+            files.extend(path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path))
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+
+def output_paths(files, output_dir):
+    """
+    Associe à chaque fichier son fichier de résultat dans output_dir, en
+    conservant les chemins relatifs au répertoire commun des entrées
+    """
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    return [
+        os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(path), base))[0] + '.json')
+        for path in files
+    ]
+
+
+def build_request(args):
+    """
+    Traduit les options de la ligne de commande en (opération, données de
+    requête) comme pour les routes de l'application
+    """
+    if args.claim:
+        operation = 'query'
+    elif args.non_circular:
+        operation = 'transform_non_circular'
+    elif args.atomic:
+        operation = 'transform_atomic'
+    else:
+        operation = 'process'
+
+    options = {
+        'minimal_arguments': args.minimal,
+        'format': args.format,
+        'timings': args.timings
+    }
+    if args.claim:
+        options['claim'] = args.claim
+    if args.non_circular:
+        options['non_circular_mode'] = args.non_circular
+    if args.semantics:
+        options['semantics'] = args.semantics
+    budget = {
+        name: value for name, value in (
+            ('max_arguments', args.max_arguments),
+            ('max_combinations', args.max_combinations),
+            ('deadline', args.deadline)
+        ) if value is not None
+    }
+    if budget:
+        options['budget'] = budget
+    return operation, options
+
+
+def _init_worker():
+    """
+    Initialisation d'un processus de calcul : chaque fichier n'est évalué
+    qu'une fois (pas de cache) et les fichiers sont déjà répartis entre les
+    processus (pas de calcul parallèle des attaques)
+    """
+    aba_core.RESULT_CACHE.max_entries = 0
+    aba_core.ATTACK_WORKERS = 1
+
+
+def evaluate_file(path, output_path, operation, options):
+    """
+    Evalue un fichier et retourne (succès, ligne JSON) ; avec output_path,
+    le résultat complet est écrit dans ce fichier et la ligne ne contient
+    que le bilan
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        record = {'file': path, 'success': True, 'result': OPERATIONS[operation](dict(options, aba_text=text))}
+    except Exception as e:
+        record = {'file': path, 'success': False, 'error': str(e)}
+    record['time_s'] = time.perf_counter() - start
+
+    if output_path is not None:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        record.pop('result', None)
+        record['output'] = output_path
+    return record['success'], json.dumps(record, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evalue des fichiers de cadres ABA / ABA+")
+    parser.add_argument('inputs', nargs='+', help="fichiers, répertoires ou motifs glob")
+    parser.add_argument('--extension', default='.aba', help="extension des fichiers des répertoires")
+    parser.add_argument('--output', '-o', default='-',
+                        help="fichier JSONL des résultats, dans l'ordre des entrées (- : sortie standard)")
+    parser.add_argument('--output-dir',
+                        help="écrit un fichier JSON par entrée ; --output ne contient alors que les bilans")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument('--chunksize', type=int, default=4, help="fichiers envoyés à la fois à un processus")
+    parser.add_argument('--non-circular', choices=('full', 'scc'),
+                        help="applique la transformation non-circulaire avant la conversion atomique")
+    parser.add_argument('--atomic', action='store_true',
+                        help="conversion atomique directe, même pour un cadre circulaire")
+    parser.add_argument('--claim',
+                        help="arguments de cette revendication et attaques qui la concernent uniquement")
+    parser.add_argument('--minimal', action='store_true', help="arguments de support minimal uniquement")
+    parser.add_argument('--semantics', help="sémantiques à calculer, séparées par des virgules")
+    parser.add_argument('--format', choices=('full', 'compact'), default='full', help="format des attaques")
+    parser.add_argument('--timings', action='store_true', help="ajoute la durée de chaque étape")
+    parser.add_argument('--max-arguments', type=int, help="budget : nombre maximal d'arguments")
+    parser.add_argument('--max-combinations', type=int, help="budget : combinaisons de prémisses essayées")
+    parser.add_argument('--deadline', type=float, help="budget : durée maximale par fichier (secondes)")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs, args.extension)
+    if not files:
+        parser.error("aucun fichier à évaluer")
+    operation, options = build_request(args)
+    outputs = output_paths(files, args.output_dir) if args.output_dir else [None] * len(files)
+    count = len(files)
+
+    start = time.perf_counter()
+    errors = 0
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        if args.workers > 1 and count > 1:
+            executor = ProcessPoolExecutor(max_workers=min(args.workers, count), initializer=_init_worker)
+            results = executor.map(evaluate_file, files, outputs, [operation] * count, [options] * count,
+                                   chunksize=max(1, args.chunksize))
+        else:
+            executor = None
+            _init_worker()
+            results = map(evaluate_file, files, outputs, [operation] * count, [options] * count)
+        try:
+            for success, line in results:
+                errors += not success
+                output.write(line + '\n')
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{count} fichiers évalués, {errors} en erreur, {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3803 @@
+"""
+Noyau de calcul ABA / ABA+ (analyse, transformations, arguments, attaques,
+sémantiques, cache et mise en forme des résultats), sans dépendance à Flask :
+utilisé par l'application web (app.py) et par la ligne de commande (aba_cli.py)
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import product
+
+def _iter_bits(mask):
+    """
+    Enumère les positions des bits à 1 d'un masque, par ordre croissant
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class SymbolTable:
+    """
+    Table des symboles d'un cadre : chaque symbole est interné une seule fois
+    (sys.intern) et reçoit un identifiant entier dense, dans l'ordre de
+    première apparition. La table ne fait que grandir : elle est partagée par
+    un cadre et ses transformations, dont les identifiants restent stables.
+    """
+    def __init__(self, symbols=()):
+        self.symbols = []   # id -> symbole
+        self.ids = {}       # symbole -> id
+        self._lock = threading.Lock()
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def intern(self, symbol):
+        """
+        Retourne l'identifiant d'un symbole (l'interne si nécessaire)
+        """
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            # Table partagée entre requêtes (cadres en cache)
+            with self._lock:
+                symbol_id = self.ids.get(symbol)
+                if symbol_id is None:
+                    symbol = sys.intern(symbol)
+                    symbol_id = len(self.symbols)
+                    self.symbols.append(symbol)
+                    self.ids[symbol] = symbol_id
+        return symbol_id
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.ids
+
+    def __getstate__(self):
+        return self.symbols
+
+    def __setstate__(self, symbols):
+        self.__init__(symbols)
+
+class Rule:
+    """
+    Règle d'un cadre ABA : nom, conclusion et prémisses (tuple), ainsi que
+    les identifiants de la conclusion et des prémisses dans la table des
+    symboles du cadre (SymbolTable)
+    """
+    __slots__ = ('name', 'conclusion', 'premises', 'conclusion_id', 'premise_ids')
+
+    def __init__(self, name, conclusion, premises, symbols):
+        self.name = name
+        self.conclusion = conclusion
+        self.premises = premises = tuple(premises)
+        get = symbols.ids.get
+        conclusion_id = get(conclusion)
+        self.conclusion_id = conclusion_id if conclusion_id is not None else symbols.intern(conclusion)
+        premise_ids = tuple([get(premise) for premise in premises])
+        if None in premise_ids:
+            # Symboles nouveaux : internés au passage
+            premise_ids = tuple([
+                symbol_id if symbol_id is not None else symbols.intern(premise)
+                for symbol_id, premise in zip(premise_ids, premises)
+            ])
+        self.premise_ids = premise_ids
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.name, self.conclusion, self.premises) == (other.name, other.conclusion, other.premises)
+
+    def __hash__(self):
+        return hash((self.name, self.conclusion, self.premises))
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.conclusion!r}, {list(self.premises)!r})"
+
+class SupportEncoding:
+    """
+    Représentation compacte des arguments : chaque assomption est internée
+    à une position de bit et chaque symbole à un identifiant entier.
+    Un argument devient une paire (id de conclusion, masque du support), de
+    sorte que l'union, l'inclusion et le test d'appartenance sont de simples
+    opérations sur des entiers.
+
+    Les identifiants de symboles sont ceux de la table symbols (SymbolTable,
+    celle du cadre), les bits sont propres à l'encodage.
+    """
+    def __init__(self, assumptions=(), symbols=None):
+        self.assumptions = []   # bit -> assomption
+        self.bits = {}          # assomption -> bit
+        self.table = symbols if symbols is not None else SymbolTable()
+        self.symbols = self.table.symbols   # id -> symbole
+        for assumption in assumptions:
+            self.assumption_bit(assumption)
+
+    def assumption_bit(self, assumption):
+        """
+        Retourne la position de bit d'une assomption (l'interne si nécessaire)
+        """
+        bit = self.bits.get(assumption)
+        if bit is None:
+            bit = len(self.assumptions)
+            self.bits[assumption] = bit
+            self.assumptions.append(assumption)
+        return bit
+
+    def symbol_id(self, symbol):
+        """
+        Retourne l'identifiant entier d'un symbole (l'interne si nécessaire)
+        """
+        return self.table.intern(symbol)
+
+    def encode_support(self, support):
+        """
+        Encode un ensemble d'assomptions en masque de bits
+        """
+        mask = 0
+        for assumption in support:
+            mask |= 1 << self.assumption_bit(assumption)
+        return mask
+
+    def decode_support(self, mask):
+        """
+        Décode un masque de bits en frozenset d'assomptions
+        """
+        return frozenset(self.assumptions[bit] for bit in _iter_bits(mask))
+
+    def encode_argument(self, argument):
+        """
+        Encode un argument (conclusion, support) en (id de conclusion, masque)
+        """
+        conclusion, support = argument
+        return (self.symbol_id(conclusion), self.encode_support(support))
+
+    def decode_argument(self, argument):
+        """
+        Décode un argument (id de conclusion, masque) en (conclusion, frozenset)
+        """
+        conclusion, mask = argument
+        return (self.symbols[conclusion], self.decode_support(mask))
+
+class SupportAntichain:
+    """
+    Antichaîne de supports (masques de bits) pour une conclusion : aucun
+    support n'en contient un autre. Les masques sont regroupés par nombre
+    d'assomptions, de sorte que la recherche d'un sous-ensemble ne parcourt
+    que les supports plus petits et celle des sur-ensembles que les plus grands.
+    """
+    def __init__(self):
+        self.by_size = {}  # nombre d'assomptions -> ensemble de masques
+
+    def is_subsumed(self, mask):
+        """
+        Retourne True si un support de l'antichaîne est inclus dans mask
+        """
+        size = bin(mask).count('1')
+        for other_size, masks in self.by_size.items():
+            if other_size <= size:
+                for other in masks:
+                    if other & mask == other:
+                        return True
+        return False
+
+    def add(self, mask):
+        """
+        Ajoute mask (supposé non subsumé) et retire les supports qui le
+        contiennent strictement. Retourne la liste des masques retirés.
+        """
+        size = bin(mask).count('1')
+        removed = []
+        for other_size, masks in self.by_size.items():
+            if other_size > size:
+                supersets = [other for other in masks if other & mask == mask]
+                masks.difference_update(supersets)
+                removed.extend(supersets)
+        self.by_size.setdefault(size, set()).add(mask)
+        return removed
+
+    def masks(self):
+        """
+        Retourne les supports de l'antichaîne, par taille puis masque croissants
+        """
+        return [mask for size in sorted(self.by_size) for mask in sorted(self.by_size[size])]
+
+def _minimal_masks(masks):
+    """
+    Retourne les masques minimaux (pour l'inclusion) d'une collection
+    """
+    antichain = SupportAntichain()
+    for mask in sorted(set(masks), key=lambda m: bin(m).count('1')):
+        if not antichain.is_subsumed(mask):
+            antichain.add(mask)
+    return antichain.masks()
+
+class PreferenceOrder:
+    """
+    Ordre strict partiel sur les assomptions, construit une fois par cadre
+
+    La fermeture transitive des préférences est calculée à la construction
+    (a > b et b > c donnent a > c), de sorte que less_than est une simple
+    recherche dans un ensemble. Les assomptions prises dans un cycle de
+    préférences (a > b > a) sont signalées dans cycles.
+    """
+    def __init__(self, preferences=()):
+        # better -> assomptions directement moins préférées
+        successors = {}
+        for better, worse in preferences:
+            successors.setdefault(better, set()).add(worse)
+            successors.setdefault(worse, set())
+
+        # x -> ensemble des assomptions strictement moins préférées que x
+        self.below = {}
+        for start in successors:
+            reached = set()
+            stack = list(successors[start])
+            while stack:
+                node = stack.pop()
+                if node in reached:
+                    continue
+                reached.add(node)
+                stack.extend(successors[node] - reached)
+            self.below[start] = frozenset(reached)
+
+        # Assomptions appartenant à un cycle de préférences
+        self.cycles = sorted(x for x, lower in self.below.items() if x in lower)
+
+    def is_consistent(self):
+        """
+        Retourne True si les préférences forment un ordre strict partiel
+        """
+        return not self.cycles
+
+    def less_than(self, assumption1, assumption2):
+        """
+        Retourne True si assumption1 < assumption2
+        """
+        return assumption1 in self.below.get(assumption2, ())
+
+    def relation(self, assumption1, assumption2):
+        """
+        Retourne: 1 si assumption1 > assumption2, -1 si assumption2 > assumption1, 0 sinon
+        """
+        if self.less_than(assumption2, assumption1):
+            return 1
+        elif self.less_than(assumption1, assumption2):
+            return -1
+        else:
+            return 0
+
+    def below_masks(self, encoding):
+        """
+        Retourne, pour chaque bit d'assomption x, le masque des assomptions y < x
+        """
+        masks = {}
+        for better, lower in self.below.items():
+            if lower:
+                masks[encoding.assumption_bit(better)] = encoding.encode_support(lower)
+        return masks
+
+class DependencyAnalysis:
+    """
+    Analyse du graphe de dépendance (conclusion -> prémisses) d'un cadre ABA
+
+    Le graphe est construit une seule fois et parcouru par l'algorithme de
+    Tarjan en version itérative (pas de limite de récursion), ce qui donne en
+    une passe linéaire :
+    - components : les composantes fortement connexes (symboles triés),
+      prémisses avant conclusions
+    - cyclic_components : les composantes contenant un cycle (taille > 1 ou
+      symbole dépendant de lui-même)
+    - topological_order : les symboles, prémisses avant conclusions
+    - depth : pour chaque symbole, la longueur de la plus longue chaîne de
+      dépendances entre composantes (0 pour un symbole sans prémisse)
+    """
+    def __init__(self, language, rules):
+        # Construire le graphe de dépendance (toutes les prémisses, même les assomptions)
+        self.graph = {symbol: [] for symbol in sorted(language)}
+        for rule in rules:
+            successors = self.graph.setdefault(rule.conclusion, [])
+            for premise in rule.premises:
+                self.graph.setdefault(premise, [])
+                if premise not in successors:
+                    successors.append(premise)
+
+        self.components = self._tarjan()
+        self.component_of = {}
+        for i, component in enumerate(self.components):
+            for symbol in component:
+                self.component_of[symbol] = i
+
+        self.cyclic_components = [
+            component for component in self.components
+            if len(component) > 1 or component[0] in self.graph[component[0]]
+        ]
+        self.is_circular = bool(self.cyclic_components)
+        self.topological_order = [symbol for component in self.components for symbol in component]
+
+        # Profondeur par composante, les prémisses étant traitées avant
+        component_depth = []
+        for i, component in enumerate(self.components):
+            depth = 0
+            for symbol in component:
+                for premise in self.graph[symbol]:
+                    j = self.component_of[premise]
+                    if j != i:
+                        depth = max(depth, component_depth[j] + 1)
+            component_depth.append(depth)
+        self.depth = {symbol: component_depth[self.component_of[symbol]] for symbol in self.graph}
+
+    def _tarjan(self):
+        """
+        Algorithme de Tarjan itératif. Les composantes sont produites dans
+        l'ordre topologique inverse du graphe, c'est-à-dire prémisses d'abord.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        counter = 0
+
+        for root in self.graph:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.graph[root]))]
+
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(self.graph[successor])))
+                        break
+                    elif successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            symbol = stack.pop()
+                            on_stack.discard(symbol)
+                            component.append(symbol)
+                            if symbol == node:
+                                break
+                        components.append(sorted(component))
+
+        return components
+
+class _DerivationInterrupted(Exception):
+    """
+    Interruption interne de MinimalDerivations par le budget (args : raison)
+    """
+
+class MinimalDerivations:
+    """
+    Supports minimaux (ensembles minimaux d'assomptions, en masques de bits)
+    dérivant chaque symbole d'un cadre, sans énumérer les arguments
+
+    Le calcul est dirigé par le but : seuls les symboles dont il dépend
+    (parcours arrière des règles) sont évalués, composante fortement connexe
+    par composante, prémisses d'abord ; les composantes cycliques sont
+    itérées jusqu'au point fixe. Les tables sont conservées d'un but à
+    l'autre.
+
+    Avec within=W, on obtient les supports minimaux parmi ceux qui
+    contiennent au moins une assomption de W.
+
+    Avec minimal=False, les tables contiennent tous les supports (ceux des
+    arguments de generate_arguments_optimized), sans within.
+
+    Si budget (ComputationBudget) est fourni, le nombre de supports d'un
+    symbole est limité à budget.max_arguments et la durée est vérifiée après
+    chaque symbole ; à l'interruption, la composante en cours est retirée des
+    tables et supports() retourne une liste vide (budget.partial).
+    """
+    def __init__(self, framework, minimal=True):
+        self.minimal = minimal
+        self.encoding = framework.get_encoding()
+        self.assumptions = framework.assumptions
+        self.analysis = framework.get_dependency_analysis()
+        self.rules_by_conclusion = {}
+        for rule in framework.rules:
+            self.rules_by_conclusion.setdefault(rule.conclusion, []).append(rule.premises)
+        self._tables = {0: {}}  # W -> symbole -> supports minimaux
+
+    def supports(self, goal, within=0, budget=None):
+        """
+        Retourne les supports minimaux (masques, par taille croissante) de goal
+        """
+        try:
+            return self._supports(goal, within, budget)
+        except _DerivationInterrupted as interruption:
+            budget.abort('derivations', interruption.args[0])
+            return []
+
+    def _supports(self, goal, within, budget):
+        table = self._tables.setdefault(within, {})
+        if goal in table:
+            return table[goal]
+
+        # Symboles nécessaires et pas encore évalués
+        needed = set()
+        stack = [goal]
+        while stack:
+            symbol = stack.pop()
+            if symbol in needed or symbol in table:
+                continue
+            needed.add(symbol)
+            for premises in self.rules_by_conclusion.get(symbol, ()):
+                stack.extend(premises)
+
+        if within:
+            # Les supports quelconques des prémisses sont nécessaires
+            for symbol in needed:
+                self._supports(symbol, 0, budget)
+
+        for component in self.analysis.components:
+            if component[0] in needed:
+                self._evaluate_component(component, within, table, budget)
+        if goal not in table:
+            # Symbole hors du langage : seulement lui-même s'il s'agit d'une assomption
+            self._evaluate_component([goal], within, table, budget)
+        return table[goal]
+
+    def _evaluate_component(self, component, within, table, budget=None):
+        """
+        Calcule les supports des symboles d'une composante (les composantes
+        dont elle dépend étant déjà évaluées)
+        """
+        for symbol in component:
+            table[symbol] = []
+        cyclic = len(component) > 1 or component[0] in self.analysis.graph.get(component[0], ())
+
+        limit = None if budget is None else budget.max_arguments
+        try:
+            changed = True
+            while changed:
+                changed = False
+                for symbol in component:
+                    supports = self._derive(symbol, within, table, limit)
+                    if limit is not None and len(supports) > limit:
+                        raise _DerivationInterrupted('max_arguments')
+                    if budget is not None and budget.expired():
+                        raise _DerivationInterrupted('deadline')
+                    if supports != table[symbol]:
+                        table[symbol] = supports
+                        changed = cyclic
+        except _DerivationInterrupted:
+            for symbol in component:
+                del table[symbol]
+            raise
+
+    def _derive(self, symbol, within, table, limit=None):
+        """
+        Supports minimaux de symbol d'après les tables courantes des prémisses
+        """
+        if not self.minimal:
+            return self._derive_all(symbol, table, limit)
+
+        antichain = SupportAntichain()
+        if symbol in self.assumptions:
+            bit = 1 << self.encoding.bits[symbol]
+            if not within or bit & within:
+                antichain.add(bit)
+
+        any_table = self._tables[0]
+        for premises in self.rules_by_conclusion.get(symbol, ()):
+            # Unions des supports des prémisses ; avec within, acc_within ne
+            # garde que les unions dont au moins un support intersecte within
+            acc_any = [0]
+            acc_within = []
+            for premise in premises:
+                premise_supports = any_table.get(premise, ())
+                if within:
+                    acc_within = _minimal_masks(
+                        [a | m for a in acc_within for m in premise_supports]
+                        + [a | m for a in acc_any for m in table.get(premise, ())]
+                    )
+                acc_any = _minimal_masks([a | m for a in acc_any for m in premise_supports])
+                if not acc_any:
+                    break
+            for mask in (acc_within if within else acc_any):
+                if not antichain.is_subsumed(mask):
+                    antichain.add(mask)
+
+        return antichain.masks()
+
+    def _derive_all(self, symbol, table, limit=None):
+        """
+        Tous les supports de symbol d'après les tables courantes des
+        prémisses (par taille croissante), au plus limit
+        """
+        supports = set()
+        if symbol in self.assumptions:
+            supports.add(1 << self.encoding.bits[symbol])
+
+        for premises in self.rules_by_conclusion.get(symbol, ()):
+            acc = {0}
+            for premise in premises:
+                acc = {a | m for a in acc for m in table.get(premise, ())}
+                if not acc:
+                    break
+                if limit is not None and len(acc) > limit:
+                    raise _DerivationInterrupted('max_arguments')
+            supports |= acc
+
+        return sorted(supports, key=lambda mask: (mask.bit_count(), mask))
+
+class AttackStore(Mapping):
+    """
+    Stockage compact des attaques d'un cadre
+
+    Pour chaque type ('standard', 'normal', 'reverse'), les attaques sont
+    conservées dans des tableaux d'entiers parallèles : attaquant, cible, bit
+    de l'assomption en jeu et, pour les attaques inverses, bit de l'assomption
+    faible y'. Les attaques sont rangées par attaquant puis par cible.
+
+    Le stockage se lit comme l'ancien dictionnaire de listes : store['standard'],
+    store['normal'], store['reverse'] et store['all_aba_plus'] sont des vues
+    dont chaque élément est construit à la lecture (avec sa description).
+    """
+    KINDS = ('standard', 'normal', 'reverse')
+
+    def __init__(self, conclusions=(), assumptions=()):
+        self.conclusions = conclusions  # Conclusion de chaque argument
+        self.assumptions = assumptions  # Assomption de chaque bit
+        self.sources = {kind: array('i') for kind in self.KINDS}
+        self.targets = {kind: array('i') for kind in self.KINDS}
+        self.via = {kind: array('i') for kind in self.KINDS}
+        self.weak = array('i')  # Attaques inverses uniquement
+
+    def add(self, kind, i, j, bit, weak_bit=-1):
+        """
+        Ajoute une attaque de l'argument i sur l'argument j
+        """
+        self.sources[kind].append(i)
+        self.targets[kind].append(j)
+        self.via[kind].append(bit)
+        if kind == 'reverse':
+            self.weak.append(weak_bit)
+
+    def extend(self, other):
+        """
+        Ajoute à la suite les attaques d'un autre stockage (mêmes arguments)
+        """
+        for kind in self.KINDS:
+            self.sources[kind].extend(other.sources[kind])
+            self.targets[kind].extend(other.targets[kind])
+            self.via[kind].extend(other.via[kind])
+        self.weak.extend(other.weak)
+
+    def count(self, kind):
+        """
+        Retourne le nombre d'attaques d'un type
+        """
+        return len(self.sources[kind])
+
+    def attack(self, kind, k):
+        """
+        Construit la k-ième attaque d'un type sous forme de dictionnaire
+        """
+        weak_bit = self.weak[k] if kind == 'reverse' else -1
+        return self.render(kind, self.sources[kind][k], self.targets[kind][k], self.via[kind][k],
+                           weak_bit, self.conclusions, self.assumptions)
+
+    @staticmethod
+    def render(kind, i, j, bit, weak_bit, conclusions, assumptions):
+        """
+        Construit le dictionnaire (avec sa description) d'une attaque
+        """
+        assumption = assumptions[bit]
+        if kind == 'standard':
+            return {
+                'type': 'standard',
+                'from': i,
+                'to': j,
+                'via_assumption': assumption,
+                'description': f"Argument {i} ({conclusions[i]}) attaque Argument {j} via l'assomption '{assumption}'"
+            }
+        if kind == 'normal':
+            return {
+                'type': 'normal',
+                'from': i,
+                'to': j,
+                'via_assumption': assumption,
+                'description': f"Attaque NORMALE: Argument {i} → Argument {j} (via '{assumption}')"
+            }
+        y_prime = assumptions[weak_bit]
+        return {
+            'type': 'reverse',
+            'from': i,  # X attaque Y
+            'to': j,    # Y est attaqué
+            'target_assumption': assumption,  # L'assomption ciblée dans X
+            'weak_assumption': y_prime,  # L'assomption faible dans Y
+            'description': f"Attaque INVERSE: Argument {i} (X) → Argument {j} (Y) - Y attaque X via '{conclusions[j]}'=C('{assumption}') mais y'='{y_prime}' < x='{assumption}'"
+        }
+
+    def to_csr(self, kind, n_arguments=None):
+        """
+        Retourne la liste d'adjacence d'un type d'attaques au format CSR :
+        (offsets, targets) où les cibles de l'argument i sont
+        targets[offsets[i]:offsets[i + 1]]
+        """
+        if n_arguments is None:
+            n_arguments = len(self.conclusions)
+        offsets = array('i', [0]) * (n_arguments + 1)
+        for i in self.sources[kind]:
+            offsets[i + 1] += 1
+        for i in range(n_arguments):
+            offsets[i + 1] += offsets[i]
+        return offsets, self.targets[kind]
+
+    def to_arrays(self):
+        """
+        Retourne les attaques sous forme de tableaux parallèles (format de
+        réponse compact) : pour chaque type, 'from', 'to' et 'via' (indice dans
+        'assumptions'), plus 'weak' pour les attaques inverses
+        """
+        result = {'assumptions': list(self.assumptions)}
+        for kind in self.KINDS:
+            result[kind] = {
+                'from': self.sources[kind].tolist(),
+                'to': self.targets[kind].tolist(),
+                'via': self.via[kind].tolist()
+            }
+        result['reverse']['weak'] = self.weak.tolist()
+        return result
+
+    def __getitem__(self, key):
+        if key == 'all_aba_plus':
+            return AttackView(self, ('normal', 'reverse'))
+        if key not in self.KINDS:
+            raise KeyError(key)
+        return AttackView(self, (key,))
+
+    def __iter__(self):
+        return iter(self.KINDS + ('all_aba_plus',))
+
+    def __len__(self):
+        return len(self.KINDS) + 1
+
+class AttackView(Sequence):
+    """
+    Vue en lecture seule sur un ou plusieurs types d'attaques d'un
+    AttackStore : chaque attaque est construite à la lecture
+    """
+    def __init__(self, store, kinds):
+        self.store = store
+        self.kinds = kinds
+
+    def __len__(self):
+        return sum(self.store.count(kind) for kind in self.kinds)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        if k < 0:
+            k += len(self)
+        for kind in self.kinds:
+            count = self.store.count(kind)
+            if 0 <= k < count:
+                return self.store.attack(kind, k)
+            k -= count
+        raise IndexError(k)
+
+    def __iter__(self):
+        for kind in self.kinds:
+            for k in range(self.store.count(kind)):
+                yield self.store.attack(kind, k)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+class NonCircularRulesView(Sequence):
+    """
+    Règles du cadre non-circulaire d'une transformation fusionnée (voir
+    ABAFramework.convert_to_non_circular_atomic) : chaque règle est
+    reconstruite à la lecture à partir de la règle atomique correspondante
+    (nom sans le préfixe atom_, assomptions l_d remplacées par l)
+    """
+    def __init__(self, atomic_rules, literals, symbols):
+        self.atomic_rules = atomic_rules
+        self.literals = {f"{literal}_d": literal for literal in literals}
+        self.symbols = symbols
+
+    def __len__(self):
+        return len(self.atomic_rules)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        rule = self.atomic_rules[k]
+        literals = self.literals
+        return Rule(rule.name[len('atom_'):], rule.conclusion,
+                    [literals.get(premise, premise) for premise in rule.premises], self.symbols)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+class ExtensionSemantics:
+    """
+    Sémantiques d'extensions sur le graphe d'attaques ABA+ (attaques normales
+    et inverses entre arguments)
+
+    Les ensembles d'arguments sont des masques de bits (bit i = argument i).
+    - grounded : point fixe de l'étiquetage, en temps linéaire
+    - admissible, complete, preferred, stable : recherche en profondeur avec
+      propagation d'étiquettes (IN / exclu). La recherche part de l'extension
+      fondée (contenue dans toute extension complète ; les arguments qu'elle
+      attaque sont exclus de toute extension admissible) et s'arrête au-delà
+      du budget de temps ou du nombre maximal d'extensions.
+    """
+    SEMANTICS = ('grounded', 'admissible', 'complete', 'preferred', 'stable')
+
+    def __init__(self, n_arguments, attacks=()):
+        self.n_arguments = n_arguments
+        self.universe = (1 << n_arguments) - 1
+        self.attackers = [0] * n_arguments  # a -> masque des attaquants de a
+        self.targets = [0] * n_arguments    # a -> masque des arguments attaqués par a
+        for i, j in attacks:
+            self.attackers[j] |= 1 << i
+            self.targets[i] |= 1 << j
+        self.self_attacking = 0
+        for a in range(n_arguments):
+            if (self.targets[a] >> a) & 1:
+                self.self_attacking |= 1 << a
+        self._grounded = None
+
+    @classmethod
+    def from_attacks(cls, attacks, n_arguments=None):
+        """
+        Construit le graphe à partir du résultat de compute_all_attacks
+        """
+        if isinstance(attacks, AttackStore):
+            if n_arguments is None:
+                n_arguments = len(attacks.conclusions)
+            pairs = [
+                pair for kind in ('normal', 'reverse')
+                for pair in zip(attacks.sources[kind], attacks.targets[kind])
+            ]
+        else:
+            pairs = [(attack['from'], attack['to']) for attack in attacks['all_aba_plus']]
+            if n_arguments is None:
+                n_arguments = max((max(pair) for pair in pairs), default=-1) + 1
+        return cls(n_arguments, pairs)
+
+    def grounded(self):
+        """
+        Retourne l'extension fondée (masque) : les arguments non attaqués sont
+        acceptés, ceux qu'ils attaquent rejetés, et ainsi de suite. Chaque
+        attaque n'est examinée qu'une fois.
+        """
+        if self._grounded is not None:
+            return self._grounded
+
+        targets = [list(_iter_bits(mask)) for mask in self.targets]
+        # Nombre d'attaquants de chaque argument qui ne sont pas encore rejetés
+        remaining = [bin(mask).count('1') for mask in self.attackers]
+        accepted = 0
+        rejected = 0
+        queue = [a for a in range(self.n_arguments) if remaining[a] == 0]
+
+        while queue:
+            a = queue.pop()
+            accepted |= 1 << a
+            for b in targets[a]:
+                if (rejected >> b) & 1:
+                    continue
+                rejected |= 1 << b
+                for c in targets[b]:
+                    remaining[c] -= 1
+                    if remaining[c] == 0 and not ((accepted | rejected) >> c) & 1:
+                        queue.append(c)
+
+        self._grounded = accepted
+        return accepted
+
+    def extensions(self, semantics, time_budget=None, max_extensions=None):
+        """
+        Enumère les extensions (masques) d'une sémantique
+
+        Retourne (extensions, finished) où finished vaut False si la recherche
+        a été interrompue par le budget de temps (en secondes) ou par le
+        nombre maximal d'extensions.
+        """
+        if semantics == 'grounded':
+            return [self.grounded()], True
+        if semantics not in self.SEMANTICS:
+            raise ValueError(f"Sémantique inconnue : {semantics}")
+
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        if semantics == 'preferred':
+            return self._preferred_extensions(deadline, max_extensions)
+
+        found = []
+        try:
+            for extension in self._search(self._initial_state(semantics), semantics, [], deadline):
+                found.append(extension)
+                if max_extensions is not None and len(found) >= max_extensions:
+                    return found, False
+        except TimeoutError:
+            return found, False
+        return found, True
+
+    def _preferred_extensions(self, deadline, max_extensions):
+        """
+        Extensions préférées : on cherche une extension complète qui n'est
+        contenue dans aucune extension déjà trouvée, puis on l'agrandit tant
+        qu'une extension complète strictement plus grande existe
+        """
+        initial = self._initial_state('complete')
+        found = []
+        try:
+            while max_extensions is None or len(found) < max_extensions:
+                candidate = next(self._search(initial, 'complete', found, deadline), None)
+                if candidate is None:
+                    return found, True
+                while True:
+                    state = self._propagate(initial, list(_iter_bits(candidate)), 0, 'complete')
+                    larger = next(self._search(state, 'complete', found + [candidate], deadline), None)
+                    if larger is None:
+                        break
+                    candidate = larger
+                found.append(candidate)
+        except TimeoutError:
+            pass
+        return found, False
+
+    def _initial_state(self, semantics):
+        """
+        Etat de départ de la recherche : les arguments auto-attaquants et ceux
+        attaqués par l'extension fondée sont exclus ; l'extension fondée est
+        acceptée (sauf pour la sémantique admissible)
+        """
+        grounded = self.grounded()
+        attacked_by_grounded = 0
+        for a in _iter_bits(grounded):
+            attacked_by_grounded |= self.targets[a]
+        pending = list(_iter_bits(grounded)) if semantics != 'admissible' else []
+        # Etat : (IN, exclus, attaqués par IN, attaquants de IN)
+        return self._propagate(
+            (0, 0, 0, 0), pending, self.self_attacking | attacked_by_grounded, semantics, full=True
+        )
+
+    def _search(self, state, semantics, forbidden, deadline):
+        """
+        Recherche en profondeur des extensions à partir d'un état propagé
+
+        Les extensions contenues dans un ensemble de forbidden sont écartées
+        (ainsi que tout état dont les extensions possibles le seraient). Lève
+        TimeoutError au-delà de deadline.
+        """
+        stack = [state] if state is not None else []
+        explored = 0
+
+        while stack:
+            explored += 1
+            if deadline is not None and explored % 64 == 0 and time.monotonic() > deadline:
+                raise TimeoutError
+
+            accepted, excluded, attacked, attacking = state = stack.pop()
+            undecided = self.universe & ~accepted & ~excluded
+
+            reachable = accepted | undecided
+            if any(not reachable & ~other for other in forbidden):
+                continue
+
+            must_be_attacked = attacking & ~attacked
+            if semantics == 'stable':
+                must_be_attacked |= excluded & ~attacked
+
+            if not undecided:
+                if not must_be_attacked:
+                    yield accepted
+                continue
+
+            if must_be_attacked:
+                # Argument à contrer ayant le moins de défenseurs possibles :
+                # une branche par défenseur d (les défenseurs précédents
+                # étant exclus), la première explorée en premier
+                b = min(_iter_bits(must_be_attacked),
+                        key=lambda b: bin(self.attackers[b] & ~excluded).count('1'))
+                defenders = list(_iter_bits(self.attackers[b] & ~excluded))
+            else:
+                # Sinon, premier argument indécis : accepté puis exclu
+                a = (undecided & -undecided).bit_length() - 1
+                defenders = [a, None]
+
+            branches = []
+            previous = 0
+            for d in defenders:
+                if d is None:
+                    branch = self._propagate(state, [], previous, semantics)
+                else:
+                    branch = self._propagate(state, [d], previous, semantics)
+                    previous |= 1 << d
+                if branch is not None:
+                    branches.append(branch)
+            stack.extend(reversed(branches))
+
+    def _propagate(self, state, pending, excluded_more, semantics, full=False):
+        """
+        Ajoute les arguments de pending à IN et ceux de excluded_more aux
+        exclus, puis propage les étiquettes jusqu'au point fixe. Retourne le
+        nouvel état ou None en cas de contradiction.
+
+        - un argument accepté exclut ses attaquants et ses cibles
+        - un attaquant de IN non encore contré doit être attaqué par un argument
+          non exclu ; s'il n'en reste qu'un, celui-ci est accepté
+        - (stable) de même pour tout argument exclu
+        - (complete, preferred, stable) un argument défendu par IN est accepté
+
+        Seuls les arguments dont la situation a changé sont réexaminés (tous
+        avec full=True).
+        """
+        accepted, excluded, attacked, attacking = state
+        new_excluded = excluded_more & ~excluded
+        excluded |= excluded_more
+        new_attacked = 0
+        new_attacking = 0
+        if accepted & excluded:
+            return None
+
+        while True:
+            while pending:
+                a = pending.pop()
+                bit = 1 << a
+                if accepted & bit:
+                    continue
+                if excluded & bit:
+                    return None
+                accepted |= bit
+                new_attacked |= self.targets[a] & ~attacked
+                new_attacking |= self.attackers[a] & ~attacking
+                new_excluded |= (self.targets[a] | self.attackers[a]) & ~excluded
+                attacked |= self.targets[a]
+                attacking |= self.attackers[a]
+                excluded |= self.targets[a] | self.attackers[a]
+                if accepted & excluded:
+                    return None
+
+            # Arguments à contrer dont les défenseurs possibles ont changé
+            affected = new_attacking | new_excluded
+            for d in _iter_bits(new_excluded):
+                affected |= self.targets[d]
+            if full:
+                affected = self.universe
+            must_be_attacked = attacking & ~attacked
+            if semantics == 'stable':
+                must_be_attacked |= excluded & ~attacked
+            for b in _iter_bits(must_be_attacked & affected):
+                defenders = self.attackers[b] & ~excluded
+                if not defenders:
+                    return None
+                if not defenders & (defenders - 1):
+                    pending.append(defenders.bit_length() - 1)
+
+            if semantics != 'admissible':
+                # Arguments dont un attaquant vient d'être attaqué
+                candidates = self.universe if full else 0
+                for d in _iter_bits(new_attacked):
+                    candidates |= self.targets[d]
+                for a in _iter_bits(candidates & ~accepted):
+                    if not self.attackers[a] & ~attacked:
+                        if (excluded >> a) & 1:
+                            return None
+                        pending.append(a)
+
+            full = False
+            new_excluded = new_attacked = new_attacking = 0
+            if not pending:
+                return accepted, excluded, attacked, attacking
+
+    def compute(self, semantics_names, time_budget=None, max_extensions=None):
+        """
+        Calcule plusieurs sémantiques et met en forme le résultat : pour
+        chacune, les extensions (listes d'indices d'arguments triés) et un
+        indicateur de recherche complète
+        """
+        result = {}
+        for semantics in semantics_names:
+            extensions, finished = self.extensions(semantics, time_budget, max_extensions)
+            result[semantics] = {
+                'extensions': [list(_iter_bits(extension)) for extension in extensions],
+                'count': len(extensions),
+                'finished': finished
+            }
+        return result
+
+# BUDGETS DE CALCUL
+
+# Les estimations de coût sont plafonnées (entiers exacts en JavaScript)
+ESTIMATE_CAP = 2 ** 53
+
+class BudgetExceeded(ValueError):
+    """
+    Requête refusée (coût estimé trop élevé) ou interrompue (budget dépassé
+    avec on_exceed='reject')
+    """
+
+class ComputationBudget:
+    """
+    Budget de calcul d'une requête : nombre maximal d'arguments, de
+    combinaisons de prémisses essayées et durée maximale (en secondes)
+
+    La génération des arguments et le calcul des attaques vérifient le budget
+    au fil du calcul et s'arrêtent proprement lorsqu'il est dépassé (abort) :
+    le résultat est alors partiel (partial), sauf avec on_exceed='reject' où
+    BudgetExceeded est levée. Avant tout calcul, admit() compare les
+    estimations de coût (voir ABAFramework.estimate_cost) à la limite
+    d'admission du serveur et, avec on_exceed='reject', au budget lui-même.
+    """
+    ON_EXCEED = ('partial', 'reject')
+
+    def __init__(self, max_arguments=None, max_combinations=None, deadline=None,
+                 on_exceed='partial', admission_limit=None):
+        if on_exceed not in self.ON_EXCEED:
+            raise ValueError(f"Valeur de on_exceed inconnue : {on_exceed}")
+        self.max_arguments = max_arguments
+        self.max_combinations = max_combinations
+        self.time_limit = deadline
+        self.deadline = time.monotonic() + deadline if deadline else None
+        self.on_exceed = on_exceed
+        self.admission_limit = admission_limit
+        self.estimate = {}
+        # Raison ('max_arguments', 'max_combinations', 'deadline') et étape
+        # de l'interruption, None si le calcul est complet
+        self.reason = None
+        self.stage = None
+
+    @classmethod
+    def from_options(cls, options=None):
+        """
+        Construit le budget d'une requête à partir de son option 'budget'
+        (max_arguments, max_combinations, deadline, on_exceed) ; les limites
+        du serveur (BUDGET_MAX_*, 0 pour aucune limite) servent de valeurs
+        par défaut et ne peuvent pas être dépassées
+        """
+        if options is None:
+            options = {}
+        if not isinstance(options, dict):
+            raise ValueError("Budget invalide : 'budget' doit être un objet")
+
+        def limit(name, ceiling, kind=int):
+            value = options.get(name)
+            if value is not None:
+                try:
+                    value = kind(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Budget invalide : {name} doit être un nombre") from None
+                if value <= 0:
+                    raise ValueError(f"Budget invalide : {name} doit être positif")
+            if ceiling:
+                value = ceiling if value is None else min(value, ceiling)
+            return value
+
+        return cls(
+            max_arguments=limit('max_arguments', BUDGET_MAX_ARGUMENTS),
+            max_combinations=limit('max_combinations', BUDGET_MAX_COMBINATIONS),
+            deadline=limit('deadline', BUDGET_DEADLINE, float),
+            on_exceed=options.get('on_exceed', 'partial'),
+            admission_limit=ADMISSION_LIMIT or None
+        )
+
+    @property
+    def partial(self):
+        return self.reason is not None
+
+    def admit(self, estimate):
+        """
+        Contrôle d'admission : lève BudgetExceeded si une estimation dépasse
+        la limite d'admission, ou le budget avec on_exceed='reject'
+        """
+        self.estimate.update(estimate)
+        if self.admission_limit is not None:
+            for name, value in estimate.items():
+                if value > self.admission_limit:
+                    raise BudgetExceeded(
+                        f"Coût estimé trop élevé : jusqu'à {value} ({name}), "
+                        f"limite d'admission {self.admission_limit}"
+                    )
+        if self.on_exceed == 'reject':
+            for name, limit in (('arguments', self.max_arguments),
+                                ('combinations', self.max_combinations)):
+                if limit is not None and estimate.get(name, 0) > limit:
+                    raise BudgetExceeded(
+                        f"Coût estimé supérieur au budget : jusqu'à {estimate[name]} {name} (budget {limit})"
+                    )
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def abort(self, stage, reason):
+        """
+        Enregistre l'interruption du calcul à l'étape stage (ou lève
+        BudgetExceeded avec on_exceed='reject')
+        """
+        if self.on_exceed == 'reject':
+            raise BudgetExceeded(f"Budget dépassé pendant le calcul ({stage}) : {reason}")
+        if self.reason is None:
+            self.reason, self.stage = reason, stage
+
+    def report(self):
+        """
+        Retourne la section 'budget' d'une réponse
+        """
+        return {
+            'limits': {
+                'max_arguments': self.max_arguments,
+                'max_combinations': self.max_combinations,
+                'deadline': self.time_limit
+            },
+            'estimate': self.estimate,
+            'partial': self.partial,
+            'reason': self.reason,
+            'stage': self.stage
+        }
+
+BUDGET_MAX_ARGUMENTS = int(os.environ.get('ABA_MAX_ARGUMENTS', 1000000))
+BUDGET_MAX_COMBINATIONS = int(os.environ.get('ABA_MAX_COMBINATIONS', 50000000))
+BUDGET_DEADLINE = float(os.environ.get('ABA_DEADLINE', 0))
+# Contrôle d'admission sur les estimations (0 : aucun, les estimations restent
+# indicatives et seuls les compteurs du budget limitent le calcul)
+ADMISSION_LIMIT = int(os.environ.get('ABA_ADMISSION_LIMIT', 0))
+
+# CALCUL PARALLÈLE DES ATTAQUES
+
+ATTACK_WORKERS = int(os.environ.get('ABA_ATTACK_WORKERS', os.cpu_count() or 1))
+PARALLEL_THRESHOLD = int(os.environ.get('ABA_PARALLEL_THRESHOLD', 20000))
+# Nombre d'attaquants traités entre deux appels de progress
+ATTACK_PROGRESS_STEP = 1024
+
+# Données partagées d'un processus de calcul des attaques (voir _init_attack_worker)
+_ATTACK_WORKER = {}
+
+def _init_attack_worker(assumptions, contraries, preferences, arguments):
+    """
+    Initialisation d'un processus du pool : construit une seule fois le cadre
+    et les index d'attaque à partir des données partagées
+    """
+    framework = ABAFramework(assumptions=set(assumptions), contraries=dict(contraries),
+                             preferences=list(preferences))
+    _ATTACK_WORKER['framework'] = framework
+    _ATTACK_WORKER['index'] = framework._build_attack_index(arguments)
+
+def _attack_shard(bounds):
+    """
+    Calcule les attaques des attaquants d'indices range(*bounds)
+    """
+    part = AttackStore()
+    _ATTACK_WORKER['framework']._fill_attacks(part, _ATTACK_WORKER['index'], range(*bounds))
+    return part
+
+class ABAFramework:
+    def __init__(self, language=None, assumptions=None, contraries=None, rules=None, preferences=None,
+                 symbols=None):
+        # Table des symboles, partagée avec les cadres transformés ; les
+        # règles (Rule) doivent avoir été créées avec cette table, les
+        # règles données sous forme de dictionnaires sont converties
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.language = language or set()
+        self.assumptions = assumptions or set()
+        self.contraries = contraries or {}
+        self.rules = [
+            rule if isinstance(rule, Rule)
+            else Rule(rule['name'], rule['conclusion'], rule['premises'], self.symbols)
+            for rule in rules or []
+        ]
+        self.preferences = preferences or []
+        # Structures dérivées, construites à la demande
+        self._encoding = None
+        self._preference_order = None
+        self._dependency_analysis = None
+        self._derivations = {}
+        
+    def convert_to_atomic(self):
+        """
+        Convertit le cadre ABA en version atomique sensible
+        Remplace chaque littéral non-assomption dans le corps des règles
+        par une nouvelle assomption s_d et ajoute une règle s_d <- s
+        """
+        atomic_aba = ABAFramework(symbols=self.symbols)
+        
+        # Étape 1: Créer le nouveau langage
+        # On garde le langage original et on ajoute les nouvelles assomptions
+        new_language = set(self.language)
+        new_assumptions = set(self.assumptions)
+        
+        # Dictionnaire pour mapper les littéraux non-assomptions vers leurs nouvelles assomptions
+        literal_to_new_assumption = {}
+        new_rules = []
+        
+        # Étape 2: Identifier tous les littéraux non-assomptions qui apparaissent dans les corps de règles
+        non_assumption_literals_in_bodies = set()
+        
+        for rule in self.rules:
+            for premise in rule.premises:
+                if premise not in self.assumptions:
+                    non_assumption_literals_in_bodies.add(premise)
+        
+        # Étape 3: Créer de nouvelles assomptions pour chaque littéral non-assomption
+        for literal in non_assumption_literals_in_bodies:
+            new_assumption_d = f"{literal}_d"  # _d pour "dérivé"
+            literal_to_new_assumption[literal] = new_assumption_d
+            new_language.add(new_assumption_d)
+            new_assumptions.add(new_assumption_d)
+
+            new_assumption_nd = f"{literal}_nd"  # _nd pour "non-dérivé"
+            new_language.add(new_assumption_nd)
+            new_assumptions.add(new_assumption_nd)
+            
+        # Étape 4: Transformer les règles originales
+        for rule in self.rules:
+            new_premises = []
+            
+            for premise in rule.premises:
+                if premise in self.assumptions:
+                    # Garder les assomptions originales
+                    new_premises.append(premise)
+                else:
+                    # Remplacer les littéraux non-assomptions par leurs nouvelles assomptions
+                    new_premises.append(literal_to_new_assumption[premise])
+            
+            new_rules.append(Rule(f"atom_{rule.name}", rule.conclusion, new_premises, self.symbols))
+        
+        # Étape 5: Mettre à jour les contraires
+        new_contraries = self.contraries.copy()
+        for literal in non_assumption_literals_in_bodies:
+            new_assumption_d = f"{literal}_d"
+            new_assumption_nd = f"{literal}_nd"
+            
+            # Contraire de _d est _nd
+            new_contraries[new_assumption_d] = new_assumption_nd
+            # Contraire de _nd est le littéral original
+            new_contraries[new_assumption_nd] = literal
+            
+        # Étape 6: Construire le nouveau cadre atomique
+        atomic_aba.language = new_language
+        atomic_aba.assumptions = new_assumptions
+        atomic_aba.contraries = new_contraries
+        atomic_aba.rules = new_rules
+        atomic_aba.preferences = self.preferences.copy()
+        
+        return atomic_aba
+
+    def get_contrary(self, assumption):
+        """
+        Retourne le contraire d'une assomption
+        """
+        return self.contraries.get(assumption)
+
+    def get_dependency_analysis(self):
+        """
+        Retourne l'analyse du graphe de dépendance du cadre (voir
+        DependencyAnalysis), calculée une seule fois puis mise en cache
+        """
+        if self._dependency_analysis is None:
+            self._dependency_analysis = DependencyAnalysis(self.language, self.rules)
+        return self._dependency_analysis
+
+    def is_circular(self):
+        """
+        Détermine si le cadre ABA contient des circularités dans les règles
+        Retourne True si circulaire, False sinon
+        """
+        return self.get_dependency_analysis().is_circular
+
+    def get_circular_dependencies(self):
+        """
+        Retourne toutes les circularités détectées dans le cadre ABA, sous la
+        forme des composantes fortement connexes cycliques (symboles triés)
+        """
+        return [list(component) for component in self.get_dependency_analysis().cyclic_components]
+
+    def convert_to_non_circular(self, mode='full'):
+        """
+        Transforme un ABA circulaire en ABA non-circulaire selon la définition exacte
+
+        mode='full' applique la définition exacte (k = |L \\ A| copies de tout
+        le langage) ; mode='scc' ne déplie que les composantes cycliques (voir
+        _non_circular_scc_plan).
+        """
+        language, assumptions, contraries, rules = self._non_circular_plan(mode)
+
+        non_circular_aba = ABAFramework(symbols=self.symbols)
+        non_circular_aba.language = language
+        non_circular_aba.assumptions = assumptions
+        non_circular_aba.contraries = contraries
+        non_circular_aba.rules = [
+            rule if rule is not None else Rule(name, conclusion, premises, self.symbols)
+            for name, conclusion, premises, rule in rules
+        ]
+        non_circular_aba.preferences = self.preferences.copy()
+
+        return non_circular_aba
+
+    def convert_to_non_circular_atomic(self, mode='full'):
+        """
+        Transformation non-circulaire puis conversion atomique en une seule
+        passe : même résultat que convert_to_non_circular(mode).convert_to_atomic()
+
+        Les règles non-circulaires sont produites à la demande (voir
+        _non_circular_plan) et converties aussitôt en règles atomiques ; elles
+        ne sont pas conservées. Retourne (cadre non-circulaire, cadre
+        atomique), les règles du premier étant une vue sur celles du second
+        (NonCircularRulesView).
+        """
+        language, assumptions, contraries, rules = self._non_circular_plan(mode)
+
+        # Conversion atomique (voir convert_to_atomic) au fil des règles
+        literals = set()
+        atomic_rules = []
+        for name, conclusion, premises, _ in rules:
+            new_premises = []
+            for premise in premises:
+                if premise in assumptions:
+                    new_premises.append(premise)
+                else:
+                    literals.add(premise)
+                    new_premises.append(f"{premise}_d")
+            atomic_rules.append(Rule(f"atom_{name}", conclusion, new_premises, self.symbols))
+
+        atomic_language = set(language)
+        atomic_assumptions = set(assumptions)
+        atomic_contraries = contraries.copy()
+        for literal in literals:
+            atomic_language.add(f"{literal}_d")
+            atomic_assumptions.add(f"{literal}_d")
+            atomic_language.add(f"{literal}_nd")
+            atomic_assumptions.add(f"{literal}_nd")
+        for literal in literals:
+            atomic_contraries[f"{literal}_d"] = f"{literal}_nd"
+            atomic_contraries[f"{literal}_nd"] = literal
+
+        non_circular_aba = ABAFramework(symbols=self.symbols)
+        non_circular_aba.language = language
+        non_circular_aba.assumptions = assumptions
+        non_circular_aba.contraries = contraries
+        if any(f"{literal}_d" in assumptions for literal in literals):
+            # Une assomption porte déjà le nom d'une assomption _d : les
+            # règles non-circulaires ne se déduisent pas des règles atomiques
+            non_circular_aba.rules = [
+                rule if rule is not None else Rule(name, conclusion, premises, self.symbols)
+                for name, conclusion, premises, rule in self._non_circular_plan(mode)[3]
+            ]
+        else:
+            non_circular_aba.rules = NonCircularRulesView(atomic_rules, literals, self.symbols)
+        non_circular_aba.preferences = self.preferences.copy()
+
+        atomic_aba = ABAFramework(symbols=self.symbols)
+        atomic_aba.language = atomic_language
+        atomic_aba.assumptions = atomic_assumptions
+        atomic_aba.contraries = atomic_contraries
+        atomic_aba.rules = atomic_rules
+        atomic_aba.preferences = self.preferences.copy()
+
+        return non_circular_aba, atomic_aba
+
+    def _non_circular_plan(self, mode):
+        """
+        Prépare la transformation non-circulaire : retourne (langage,
+        assomptions, contraires, règles) du cadre transformé, les règles étant
+        un générateur de (nom, conclusion, prémisses, règle) où règle est la
+        règle d'origine lorsqu'elle est conservée telle quelle (None sinon)
+        """
+        if mode == 'scc':
+            return self._non_circular_scc_plan()
+        if mode != 'full':
+            raise ValueError(f"Mode de transformation non-circulaire inconnu : {mode}")
+
+        # Étape 1: Calculer k = |L \ A|
+        non_assumption_language = self.language - self.assumptions
+        k = len(non_assumption_language)
+        
+        # Étape 2: Créer les nouveaux éléments de langage
+        new_language = set(self.language)  # L° = L ∪ {s^j}
+        new_assumptions = set(self.assumptions)
+        new_contraries = self.contraries.copy()
+        
+        # Dictionnaire pour mapper les symboles à leurs nouvelles versions
+        symbol_mapping = {}
+        
+        # Créer des symboles distincts pour TOUTES les versions s^j, y compris s^1
+        for s in self.language:
+            for j in range(1, k + 1):
+                new_symbol = f"{s}_{j}"  # Toujours créer s_1, s_2, s_3, etc.
+                symbol_mapping[(s, j)] = new_symbol
+                new_language.add(new_symbol)
+                
+                # Les nouvelles versions s^j deviennent des assomptions si s ∉ A
+                if s in non_assumption_language:
+                    new_assumptions.add(new_symbol)
+                    if s in self.contraries:
+                        new_contraries[new_symbol] = self.contraries[s]
+        
+        # Étape 3: Traiter les règles (à la demande)
+        def rules():
+            rule_counter = 0
+            
+            for rule in self.rules:
+                s = rule.conclusion
+                premises = rule.premises
+                
+                if not premises:  # Règle atomique
+                    # Créer k versions s^j ← pour j=1 à k
+                    for j in range(1, k + 1):
+                        yield f"r_{rule_counter}", symbol_mapping[(s, j)], (), None
+                        rule_counter += 1
+                            
+                else:  # Règle non-atomique
+                    # Créer k-1 versions s^j ← p'^1, ..., p'^n pour j=2 à k
+                    for j in range(2, k + 1):
+                        new_premises = []
+                        
+                        for p in premises:
+                            if p in self.assumptions:
+                                # p' = p (garder l'assomption originale)
+                                new_premises.append(p)
+                            else:
+                                # p' = p^{j-1}
+                                new_premises.append(symbol_mapping[(p, j-1)])
+                        
+                        yield f"r_{rule_counter}", symbol_mapping[(s, j)], new_premises, None
+                        rule_counter += 1
+        
+        return new_language, new_assumptions, new_contraries, rules()
+
+    def get_cyclic_unfolding(self):
+        """
+        Retourne, pour chaque composante cyclique du graphe de dépendance, la
+        liste triée de ses non-assomptions et le nombre k de niveaux de
+        dépliage nécessaires (une chaîne sans répétition dans la composante
+        passe au plus une fois par chacune de ses non-assomptions)
+        """
+        unfolding = []
+        for component in self.get_dependency_analysis().cyclic_components:
+            members = [symbol for symbol in component if symbol not in self.assumptions]
+            if members:
+                unfolding.append((members, len(members)))
+        return unfolding
+
+    def get_non_circular_full_size(self):
+        """
+        Retourne (taille du langage, nombre de règles) qu'aurait le cadre
+        produit par convert_to_non_circular(mode='full'), sans le construire
+        """
+        k = len(self.language - self.assumptions)
+        copies = {f"{s}_{j}" for s in self.language for j in range(1, k + 1)}
+        return len(self.language | copies), self.get_non_circular_rules_count()
+
+    def get_non_circular_rules_count(self):
+        """
+        Retourne le nombre de règles qu'aurait le cadre produit par
+        convert_to_non_circular(mode='full') (majorant pour le mode 'scc')
+        """
+        k = len(self.language - self.assumptions)
+        return sum(k if not rule.premises else max(k - 1, 0) for rule in self.rules)
+
+    def _non_circular_scc_plan(self):
+        """
+        Transformation non-circulaire limitée aux composantes cycliques (même
+        forme de résultat que _non_circular_plan)
+
+        Les règles dont la conclusion n'appartient à aucune composante cyclique
+        sont conservées telles quelles. Pour une composante C dépliée en k
+        niveaux, chaque non-assomption s de C reçoit les copies s_1..s_{k-1},
+        le niveau k étant s lui-même ; chaque règle s <- p1..pn produit
+        s^j <- p1'..pn' pour j = 1..k, où p' = p^{j-1} si p appartient à C
+        (la règle est omise au niveau 1) et p' = p sinon. Une règle concluant
+        une assomption d'une composante cyclique conclut la copie s_1.
+
+        Pour un cadre plat (aucune assomption conclue par une règle), chaque
+        symbole d'origine garde les mêmes supports minimaux que dans le cadre
+        d'origine. Ce n'est plus garanti lorsqu'une assomption est conclue
+        dans une composante cyclique, ses règles étant redirigées vers s_1.
+        """
+        new_language = set(self.language)
+        component_of = self.get_dependency_analysis().component_of
+
+        # Symbole cyclique -> (copies par niveau, k)
+        levels = {}
+        for members, k in self.get_cyclic_unfolding():
+            for s in members:
+                copies = {j: f"{s}_{j}" for j in range(1, k)}
+                copies[k] = s
+                levels[s] = (copies, k)
+                new_language.update(copies.values())
+
+        cyclic_symbols = {
+            symbol
+            for component in self.get_dependency_analysis().cyclic_components
+            for symbol in component
+        }
+
+        # Assomptions conclues dans une composante cyclique : comme dans la
+        # transformation complète, leurs règles concluent une copie s_1, ce
+        # qui coupe les cycles passant par l'assomption
+        for rule in self.rules:
+            if rule.conclusion in self.assumptions and rule.conclusion in cyclic_symbols:
+                new_language.add(f"{rule.conclusion}_1")
+
+        def rules():
+            for rule in self.rules:
+                s = rule.conclusion
+                if s in self.assumptions and s in cyclic_symbols:
+                    yield rule.name, f"{s}_1", rule.premises, None
+                    continue
+                if s not in levels:
+                    # Règle hors de toute composante cyclique : inchangée
+                    yield rule.name, s, rule.premises, rule
+                    continue
+
+                copies, k = levels[s]
+                component = component_of[s]
+                for j in range(1, k + 1):
+                    new_premises = []
+                    for p in rule.premises:
+                        if p in levels and component_of[p] == component:
+                            if j == 1:
+                                # Niveau 1 : seules les prémisses hors de C sont utilisables
+                                new_premises = None
+                                break
+                            new_premises.append(levels[p][0][j - 1])
+                        else:
+                            new_premises.append(p)
+                    if new_premises is None:
+                        continue
+                    yield f"{rule.name}_{j}", copies[j], new_premises, None
+
+        return new_language, set(self.assumptions), self.contraries.copy(), rules()
+
+    def get_encoding(self):
+        """
+        Retourne l'encodage compact (assomptions -> bits, symboles -> entiers)
+        associé à ce cadre, construit une seule fois
+        """
+        if self._encoding is None:
+            self._encoding = SupportEncoding(sorted(self.assumptions), self.symbols)
+        return self._encoding
+
+    def get_derivations(self, minimal=True):
+        """
+        Retourne la table des supports minimaux (ou de tous les supports avec
+        minimal=False) du cadre (voir MinimalDerivations), complétée au fil
+        des requêtes
+        """
+        if minimal not in self._derivations:
+            self._derivations[minimal] = MinimalDerivations(self, minimal)
+        return self._derivations[minimal]
+
+    def generate_arguments_optimized(self, max_iterations=100, compact=False, minimal=False, stats=None,
+                                     budget=None):
+        """
+        Génère tous les arguments par évaluation semi-naïve (pilotée par le delta)
+
+        A chaque tour, seules les combinaisons utilisant au moins un argument
+        produit au tour précédent sont jointes. L'index par conclusion est
+        conservé d'un tour à l'autre et la déduplication se fait par ensemble.
+        L'ordre des arguments est identique à celui de l'évaluation naïve.
+
+        Les supports sont manipulés sous forme de masques de bits (voir
+        SupportEncoding). Avec compact=True, les arguments sont retournés tels
+        quels sous forme de paires (id de conclusion, masque) ; sinon ils sont
+        décodés en paires (conclusion, frozenset d'assomptions).
+
+        Avec minimal=True, seuls les arguments de support minimal (pour
+        l'inclusion) sont conservés : un argument dont le support contient
+        celui d'un autre argument de même conclusion est élagué dès sa
+        découverte et n'est plus combiné aux tours suivants.
+
+        Si stats (dictionnaire) est fourni, il reçoit le nombre de tours
+        ('rounds') et de combinaisons de prémisses essayées ('combinations').
+
+        Si budget (ComputationBudget) est fourni, la génération s'arrête dès
+        que le nombre d'arguments, de combinaisons essayées ou la durée
+        dépasse le budget ; les candidats du tour interrompu sont abandonnés
+        et seuls les arguments déjà retenus sont retournés (budget.partial).
+        """
+        encoding = self.get_encoding()
+        arguments = list(self._iter_compact_arguments(max_iterations, minimal, stats, budget))
+
+        if compact:
+            return arguments
+        return [encoding.decode_argument(arg) for arg in arguments]
+
+    def iter_arguments(self, max_iterations=100, compact=False, minimal=False, stats=None, budget=None):
+        """
+        Enumère les arguments au fur et à mesure de leur découverte, dans le
+        même ordre que generate_arguments_optimized. En mode minimal, un
+        argument peut être élagué par une découverte ultérieure : les
+        arguments ne sont alors produits qu'à la fin du calcul.
+        """
+        encoding = self.get_encoding()
+        for arg in self._iter_compact_arguments(max_iterations, minimal, stats, budget):
+            yield arg if compact else encoding.decode_argument(arg)
+
+    def _iter_compact_arguments(self, max_iterations, minimal, stats=None, budget=None):
+        """
+        Moteur d'évaluation semi-naïve : produit les arguments compacts
+        (id de conclusion, masque) dès qu'ils sont ajoutés (stats et budget :
+        voir generate_arguments_optimized)
+        """
+        encoding = self.get_encoding()
+        seen = set()
+        # Index persistant : id de conclusion -> masques (dans l'ordre d'ajout),
+        # None pour un argument élagué en mode minimal
+        args_by_conclusion = {}
+        # Mode minimal : arguments retenus, antichaîne des supports et
+        # position de chaque masque
+        retained = []
+        antichains = {}
+        positions = {}
+        pruned = set()
+
+        # Limites du budget (comparaisons entières dans la boucle ; la durée
+        # n'est vérifiée que toutes les 1024 combinaisons)
+        max_arguments = float('inf')
+        max_tried = float('inf')
+        if budget is not None:
+            if budget.max_arguments is not None:
+                max_arguments = budget.max_arguments
+            if budget.max_combinations is not None:
+                max_tried = budget.max_combinations
+        aborted = None
+
+        # Arguments de base : chaque assomption est un argument pour elle-même
+        for assumption in self.assumptions:
+            if len(seen) >= max_arguments:
+                aborted = 'max_arguments'
+                break
+            arg = (encoding.symbol_id(assumption), encoding.encode_support([assumption]))
+            seen.add(arg)
+            args_by_conclusion.setdefault(arg[0], []).append(arg[1])
+            if not minimal:
+                yield arg
+            else:
+                retained.append(arg)
+                antichains.setdefault(arg[0], SupportAntichain()).add(arg[1])
+                positions.setdefault(arg[0], {})[arg[1]] = len(args_by_conclusion[arg[0]]) - 1
+
+        # Règles encodées : (id de conclusion, ids des prémisses)
+        encoded_rules = [(rule.conclusion_id, rule.premise_ids) for rule in self.rules]
+
+        # Début du delta (arguments du tour précédent) pour chaque conclusion
+        delta_start = {conclusion: 0 for conclusion in args_by_conclusion}
+        iteration = 0
+        tried = 0
+
+        while delta_start and iteration < max_iterations and not aborted:
+            if budget is not None and budget.expired():
+                aborted = 'deadline'
+                break
+            iteration += 1
+            # Taille de chaque liste au début du tour (instantané)
+            sizes = {c: len(masks) for c, masks in args_by_conclusion.items()}
+
+            # Nouvel argument -> plus petite clé (règle, indices) qui le produit,
+            # afin de reproduire l'ordre d'ajout de l'évaluation naïve
+            candidates = {}
+
+            for rule_index, (conclusion, premises) in enumerate(encoded_rules):
+                if not premises:
+                    # Une règle sans prémisse ne produit qu'au premier tour
+                    if iteration == 1:
+                        combinations = [()]
+                    else:
+                        continue
+                else:
+                    combinations = self._find_valid_combinations(
+                        premises, sizes, delta_start, args_by_conclusion if minimal else None
+                    )
+
+                for indices in combinations:
+                    tried += 1
+                    if tried > max_tried:
+                        aborted = 'max_combinations'
+                        break
+                    if budget is not None and tried & 1023 == 0 and budget.expired():
+                        aborted = 'deadline'
+                        break
+                    # Calculer le support complet (union des masques)
+                    full_support = 0
+                    for premise, index in zip(premises, indices):
+                        full_support |= args_by_conclusion[premise][index]
+
+                    new_arg = (conclusion, full_support)
+
+                    if new_arg in seen:
+                        continue
+                    key = (rule_index, indices)
+                    if new_arg not in candidates or key < candidates[new_arg]:
+                        candidates[new_arg] = key
+                if aborted:
+                    break
+            if aborted:
+                break
+
+            # Le delta du prochain tour commence à la taille actuelle des listes
+            delta_start = {}
+            for new_arg in sorted(candidates, key=candidates.get):
+                if len(seen) >= max_arguments:
+                    aborted = 'max_arguments'
+                    break
+                conclusion, mask = new_arg
+                if minimal:
+                    antichain = antichains.setdefault(conclusion, SupportAntichain())
+                    if antichain.is_subsumed(mask):
+                        continue
+                    # Les arguments de support strictement plus grand sont élagués
+                    for removed in antichain.add(mask):
+                        args_by_conclusion[conclusion][positions[conclusion].pop(removed)] = None
+                        pruned.add((conclusion, removed))
+                    positions.setdefault(conclusion, {})[mask] = len(args_by_conclusion.get(conclusion, ()))
+                    retained.append(new_arg)
+                else:
+                    yield new_arg
+                seen.add(new_arg)
+                if conclusion not in delta_start:
+                    delta_start[conclusion] = sizes.get(conclusion, 0)
+                args_by_conclusion.setdefault(conclusion, []).append(mask)
+            if aborted:
+                break
+
+        if stats is not None:
+            stats['rounds'] = iteration
+            stats['combinations'] = tried
+        if aborted:
+            budget.abort('arguments', aborted)
+
+        for arg in retained:
+            if arg not in pruned:
+                yield arg
+
+    def _find_valid_combinations(self, premises, sizes, delta_start, args_by_conclusion=None):
+        """
+        Enumère les combinaisons d'indices d'arguments qui satisfont toutes les
+        prémisses et utilisent au moins un argument du delta
+
+        sizes donne la taille de chaque liste au début du tour et delta_start
+        l'indice du premier argument nouveau du tour précédent. Chaque
+        combinaison est produite une seule fois : la position i est la première
+        à prendre un argument du delta, les positions précédentes prennent
+        uniquement d'anciens arguments. Si args_by_conclusion est fourni, les
+        positions élaguées (None) sont ignorées.
+        """
+        # Vérifier que toutes les prémisses peuvent être satisfaites
+        for premise in premises:
+            if premise not in sizes:
+                return  # Impossible de satisfaire cette prémisse
+
+        for i, premise in enumerate(premises):
+            if premise not in delta_start:
+                continue
+            ranges = []
+            for j, other in enumerate(premises):
+                if j < i:
+                    indices = range(delta_start.get(other, sizes[other]))
+                elif j == i:
+                    indices = range(delta_start[premise], sizes[premise])
+                else:
+                    indices = range(sizes[other])
+                if args_by_conclusion is not None:
+                    masks = args_by_conclusion[other]
+                    indices = [k for k in indices if masks[k] is not None]
+                ranges.append(indices)
+            yield from product(*ranges)
+
+    def estimate_cost(self):
+        """
+        Majorants du coût de generate_arguments_optimized et du calcul des
+        attaques, déduits de la structure des règles sans rien énumérer :
+        - arguments : pour chaque symbole, somme sur ses règles du produit
+          des majorants des prémisses (1 de plus pour une assomption), et au
+          plus 2^n supports où n est le nombre d'assomptions dont il dépend
+          (seule borne utilisée dans une composante cyclique)
+        - combinations : combinaisons de prémisses essayées
+        - standard_attacks : pour chaque assomption a, arguments pour son
+          contraire multipliés par les arguments dont le support contient a
+          (les attaques normales et inverses ne sont pas plus nombreuses)
+        Les valeurs sont plafonnées à ESTIMATE_CAP. Pour un cadre atomique
+        (prémisses toutes assomptions), arguments et combinaisons sont exacts
+        à la déduplication près.
+        """
+        def capped_product(values):
+            result = 1
+            for value in values:
+                result = min(result * value, ESTIMATE_CAP)
+            return result
+
+        analysis = self.get_dependency_analysis()
+        cyclic = {symbol for component in analysis.cyclic_components for symbol in component}
+
+        # Assomptions dont dépend chaque composante (les siennes et celles des
+        # composantes de ses prémisses, traitées avant elle), en masque de bits
+        assumption_bits = {assumption: i for i, assumption in enumerate(sorted(self.assumptions))}
+        reachable = []
+        for i, component in enumerate(analysis.components):
+            mask = 0
+            for symbol in component:
+                if symbol in assumption_bits:
+                    mask |= 1 << assumption_bits[symbol]
+                for premise in analysis.graph[symbol]:
+                    j = analysis.component_of[premise]
+                    if j != i:
+                        mask |= reachable[j]
+            reachable.append(mask)
+
+        def support_bound(symbol):
+            # Nombre de supports distincts possibles
+            return 1 << min(reachable[analysis.component_of[symbol]].bit_count(), 53)
+
+        rules_by_conclusion = {}
+        for rule in self.rules:
+            rules_by_conclusion.setdefault(rule.conclusion, []).append(rule)
+
+        bound = {}
+        combinations = 0
+        for symbol in analysis.topological_order:
+            if symbol in cyclic:
+                bound[symbol] = support_bound(symbol)
+                continue
+            count = 1 if symbol in self.assumptions else 0
+            for rule in rules_by_conclusion.get(symbol, ()):
+                count = min(count + capped_product(bound[p] for p in rule.premises), ESTIMATE_CAP)
+            bound[symbol] = min(count, support_bound(symbol))
+        for rule in self.rules:
+            combinations = min(combinations + capped_product(bound[p] for p in rule.premises), ESTIMATE_CAP)
+        arguments = min(sum(bound.values()), ESTIMATE_CAP)
+
+        # Arguments dont le support contient a : exact pour un cadre plat,
+        # tous les arguments sinon
+        flat = all(p in self.assumptions for rule in self.rules for p in rule.premises)
+        containing = {}
+        if flat:
+            for rule in self.rules:
+                for premise in set(rule.premises):
+                    containing[premise] = containing.get(premise, 0) + 1
+        standard_attacks = 0
+        for assumption in self.assumptions:
+            attackers = bound.get(self.contraries.get(assumption), 0)
+            targets = containing.get(assumption, 0) + 1 if flat else arguments
+            standard_attacks = min(standard_attacks + attackers * targets, ESTIMATE_CAP)
+
+        return {
+            'arguments': arguments,
+            'combinations': combinations,
+            'standard_attacks': standard_attacks
+        }
+
+    def add_preference(self, better, worse):
+        """
+        Ajoute une préférence: better > worse
+        """
+        if better not in self.assumptions or worse not in self.assumptions:
+            raise ValueError("Les préférences ne peuvent être définies que entre assomptions")
+        
+        self.preferences.append((better, worse))
+        self._preference_order = None
+
+    def get_preference_order(self):
+        """
+        Retourne l'ordre de préférence (fermé transitivement) du cadre,
+        construit une seule fois. Lève ValueError si les préférences sont
+        cycliques.
+        """
+        if self._preference_order is None:
+            order = PreferenceOrder(self.preferences)
+            if not order.is_consistent():
+                raise ValueError(
+                    "Préférences incohérentes : cycle impliquant " + ', '.join(order.cycles)
+                )
+            self._preference_order = order
+        return self._preference_order
+    
+    def get_preference_relation(self, assumption1, assumption2):
+        """
+        Retourne la relation de préférence entre deux assomptions
+        Retourne: 1 si assumption1 > assumption2, -1 si assumption2 > assumption1, 0 sinon
+        """
+        return self.get_preference_order().relation(assumption1, assumption2)
+
+    def _build_attack_index(self, arguments):
+        """
+        Construit les index utilisés par le calcul des attaques
+
+        Les supports sont encodés une seule fois en masques de bits (les
+        arguments compacts produits par generate_arguments_optimized(compact=True)
+        sont acceptés tels quels). Index construits : contraire -> masque des
+        assomptions, bit d'assomption -> arguments dont le support la contient,
+        conclusion -> arguments (indices croissants) et, pour chaque assomption x,
+        le masque des assomptions y telles que y < x (fermeture transitive).
+        """
+        encoding = self.get_encoding()
+
+        conclusions = []
+        masks = []
+        arguments_by_assumption = {}
+        arguments_by_conclusion = {}
+        for i, (conclusion, support) in enumerate(arguments):
+            if isinstance(support, int):
+                # Argument compact : (id de conclusion, masque)
+                conclusion = encoding.symbols[conclusion]
+                mask = support
+            else:
+                mask = encoding.encode_support(support)
+            conclusions.append(conclusion)
+            masks.append(mask)
+            arguments_by_conclusion.setdefault(conclusion, []).append(i)
+            for bit in _iter_bits(mask):
+                arguments_by_assumption.setdefault(bit, []).append(i)
+
+        contrary_masks = {}
+        contrary_by_bit = {}
+        for assumption, contrary in self.contraries.items():
+            bit = encoding.assumption_bit(assumption)
+            contrary_masks[contrary] = contrary_masks.get(contrary, 0) | (1 << bit)
+            contrary_by_bit[bit] = contrary
+
+        below_masks = self.get_preference_order().below_masks(encoding)
+
+        # Seules les assomptions préférées à une autre peuvent être ciblées
+        # par une attaque inverse
+        preferred_mask = 0
+        for bit in below_masks:
+            preferred_mask |= 1 << bit
+
+        return {
+            'encoding': encoding,
+            'conclusions': conclusions,
+            'masks': masks,
+            'contrary_masks': contrary_masks,
+            'contrary_by_bit': contrary_by_bit,
+            'below_masks': below_masks,
+            'preferred_mask': preferred_mask,
+            'arguments_by_assumption': arguments_by_assumption,
+            'arguments_by_conclusion': arguments_by_conclusion
+        }
+
+    def compute_standard_attacks(self, arguments, index=None):
+        """
+        Calcule les attaques standard ABA (sans préférences)
+
+        Seules les paires dont la conclusion de l'attaquant est le contraire
+        d'une assomption du support de la cible sont énumérées.
+        """
+        if index is None:
+            index = self._build_attack_index(arguments)
+        return list(self._iter_standard_attacks(index))
+
+    def _iter_standard_attacks(self, index, attackers=None):
+        """
+        Enumère les attaques standard des arguments attaquants donnés (tous par
+        défaut), par attaquant puis par cible croissants
+        """
+        for i, j, bit in self._iter_standard_triples(index, attackers):
+            yield self._standard_attack(index, i, j, bit)
+
+    def _iter_standard_triples(self, index, attackers=None):
+        """
+        Enumère les attaques standard sous forme de triplets (attaquant, cible,
+        bit de l'assomption attaquée), dans l'ordre de _iter_standard_attacks
+        """
+        conclusions = index['conclusions']
+        masks = index['masks']
+        contrary_masks = index['contrary_masks']
+        arguments_by_assumption = index['arguments_by_assumption']
+
+        if attackers is None:
+            attackers = range(len(conclusions))
+
+        for i in attackers:
+            conc1 = conclusions[i]
+            attacked_mask = contrary_masks.get(conc1)
+            if not attacked_mask:
+                continue
+
+            # Cibles possibles : arguments dont le support contient une assomption attaquée
+            targets = set()
+            for bit in _iter_bits(attacked_mask):
+                targets.update(arguments_by_assumption.get(bit, ()))
+
+            for j in sorted(targets):
+                if i == j:
+                    continue  # Un argument n'attaque pas lui-même
+
+                # Chaque assomption du support de la cible dont conc1 est le contraire
+                for bit in _iter_bits(masks[j] & attacked_mask):
+                    yield i, j, bit
+
+    def _standard_attack(self, index, i, j, bit):
+        """
+        Construit l'attaque standard de l'argument i sur l'argument j via
+        l'assomption de bit donné
+        """
+        return AttackStore.render('standard', i, j, bit, -1, index['conclusions'], index['encoding'].assumptions)
+
+    def compute_normal_attacks(self, arguments, standard_attacks, index=None):
+        """
+        Calcule les attaques NORMALES ABA+
+        """
+        if index is None:
+            index = self._build_attack_index(arguments)
+
+        normal_attacks = []
+        
+        for attack in standard_attacks:
+            normal_attack = self._to_normal_attack(index, attack)
+            if normal_attack is not None:
+                normal_attacks.append(normal_attack)
+        
+        return normal_attacks
+
+    def _is_normal(self, index, i, bit):
+        """
+        Indique si l'attaque standard de l'argument i via l'assomption de bit
+        donné est une attaque normale : aucune assomption de l'attaquant n'est
+        strictement moins préférée que l'assomption ciblée
+        """
+        return not index['masks'][i] & index['below_masks'].get(bit, 0)
+
+    def _to_normal_attack(self, index, attack):
+        """
+        Retourne l'attaque normale correspondant à une attaque standard, ou
+        None si une assomption de l'attaquant est strictement moins préférée
+        que l'assomption ciblée
+        """
+        attacker_idx = attack['from']
+        target_bit = index['encoding'].bits[attack['via_assumption']]
+        if not self._is_normal(index, attacker_idx, target_bit):
+            return None
+
+        return AttackStore.render(
+            'normal', attacker_idx, attack['to'], target_bit, -1,
+            index['conclusions'], index['encoding'].assumptions
+        )
+
+    def compute_reverse_attacks(self, arguments, index=None):
+        """
+        Calcule les attaques INVERSES selon la définition stricte ABA+
+
+        Pour chaque argument X, seuls les arguments Y concluant le contraire
+        d'une assomption x de X (préférée à au moins une autre assomption)
+        sont examinés.
+        """
+        if index is None:
+            index = self._build_attack_index(arguments)
+        return list(self._iter_reverse_attacks(index))
+
+    def _iter_reverse_attacks(self, index, attackers=None):
+        """
+        Enumère les attaques inverses des arguments attaquants donnés (tous
+        par défaut), par attaquant puis par cible croissants
+        """
+        for i, j, x_bit, weak_bit in self._iter_reverse_triples(index, attackers):
+            yield self._reverse_attack(index, i, j, x_bit, weak_bit)
+
+    def _iter_reverse_triples(self, index, attackers=None):
+        """
+        Enumère les attaques inverses sous forme de quadruplets (X, Y, bit de
+        x, bit de y'), dans l'ordre de _iter_reverse_attacks
+        """
+        conclusions = index['conclusions']
+        masks = index['masks']
+        contrary_masks = index['contrary_masks']
+        contrary_by_bit = index['contrary_by_bit']
+        below_masks = index['below_masks']
+        arguments_by_conclusion = index['arguments_by_conclusion']
+
+        preferred_mask = index['preferred_mask']
+
+        if attackers is None:
+            attackers = range(len(masks))
+
+        for i in attackers:  # X = supp_i
+            targeted = masks[i] & preferred_mask
+            if not targeted:
+                continue
+
+            candidates = set()
+            for bit in _iter_bits(targeted):
+                contrary_x = contrary_by_bit.get(bit)
+                if contrary_x:
+                    candidates.update(arguments_by_conclusion.get(contrary_x, ()))
+
+            for j in sorted(candidates):  # Y = supp_j
+                if i == j:
+                    continue
+                conc_j = conclusions[j]
+
+                # x ∈ X tel que Y conclut ¯x
+                for x_bit in _iter_bits(targeted & contrary_masks.get(conc_j, 0)):
+                    # Condition de préférence faible : y' ∈ Y avec y' < x
+                    weak = masks[j] & below_masks[x_bit]
+                    if weak:
+                        yield i, j, x_bit, (weak & -weak).bit_length() - 1
+
+    def _reverse_attack(self, index, i, j, x_bit, weak_bit):
+        """
+        Construit l'attaque inverse de l'argument i (X) sur l'argument j (Y) :
+        Y conclut le contraire de x (bit x_bit) et y' (bit weak_bit) est
+        l'assomption de Y moins préférée que x
+        """
+        return AttackStore.render('reverse', i, j, x_bit, weak_bit, index['conclusions'], index['encoding'].assumptions)
+
+    def iter_attacks(self, arguments):
+        """
+        Enumère les attaques au fur et à mesure de leur découverte, attaquant
+        par attaquant : attaques standard (chacune suivie de l'attaque normale
+        correspondante si elle est valide) puis attaques inverses. Aucune liste
+        d'attaques n'est conservée en mémoire.
+        """
+        index = self._build_attack_index(arguments)
+
+        for i in range(len(index['conclusions'])):
+            for attack in self._iter_standard_attacks(index, (i,)):
+                yield attack
+                normal_attack = self._to_normal_attack(index, attack)
+                if normal_attack is not None:
+                    yield normal_attack
+            yield from self._iter_reverse_attacks(index, (i,))
+
+    def compute_all_attacks(self, arguments, workers=None, progress=None, budget=None):
+        """
+        Calcule tous les types d'attaques selon la définition stricte ABA+
+
+        Les attaques sont rangées dans un AttackStore (tableaux d'entiers) :
+        store['standard'], store['normal'], store['reverse'] et
+        store['all_aba_plus'] se parcourent comme des listes d'attaques, dont
+        les descriptions ne sont construites qu'à la lecture.
+
+        Au-delà de PARALLEL_THRESHOLD arguments (ou si workers > 1), les
+        attaquants sont répartis par tranches entre ATTACK_WORKERS processus ;
+        le résultat est identique au calcul séquentiel.
+
+        progress('attacks', attaquants traités, nombre d'arguments), si
+        fourni, est appelé après chaque tranche d'attaquants.
+
+        Si budget (ComputationBudget) a une durée maximale, elle est vérifiée
+        entre deux tranches : à échéance, seules les attaques des premiers
+        attaquants sont retournées (budget.partial).
+        """
+        if workers is None:
+            workers = ATTACK_WORKERS if len(arguments) >= PARALLEL_THRESHOLD else 1
+        if workers > 1 and len(arguments) > 1:
+            try:
+                return self._compute_attacks_parallel(arguments, workers, progress, budget)
+            except (OSError, BrokenProcessPool):
+                pass  # Processus indisponibles : calcul séquentiel
+
+        # Index construits une seule fois pour les trois calculs
+        index = self._build_attack_index(arguments)
+        store = AttackStore(index['conclusions'], index['encoding'].assumptions)
+        if progress is None and (budget is None or budget.deadline is None):
+            self._fill_attacks(store, index)
+            return store
+
+        # Par tranches pour suivre l'avancement (l'ordre de chaque type
+        # d'attaques est inchangé)
+        for stop, _ in self._fill_attack_chunks(store, index, budget):
+            if progress is not None:
+                progress('attacks', stop, len(arguments))
+        return store
+
+    def iter_attack_chunks(self, arguments, budget=None):
+        """
+        Calcule les attaques par tranches de ATTACK_PROGRESS_STEP attaquants
+        dans un même AttackStore (rien pour une liste d'arguments vide)
+
+        Après chaque tranche, produit (store, before) où before[kind] est le
+        nombre d'attaques de chaque type avant la tranche : les attaques de la
+        tranche sont store.attack(kind, k) pour before[kind] <= k <
+        store.count(kind). Le stockage final est celui de compute_all_attacks.
+        """
+        index = self._build_attack_index(arguments)
+        store = AttackStore(index['conclusions'], index['encoding'].assumptions)
+        for _, before in self._fill_attack_chunks(store, index, budget):
+            yield store, before
+
+    def _fill_attack_chunks(self, store, index, budget=None):
+        """
+        Ajoute à store les attaques de tous les arguments, tranche par
+        tranche ; produit (attaquants traités, nombres d'attaques avant la
+        tranche). A échéance du budget, s'arrête (budget.partial).
+        """
+        n = len(index['conclusions'])
+        for start in range(0, n, ATTACK_PROGRESS_STEP):
+            if budget is not None and budget.expired():
+                budget.abort('attacks', 'deadline')
+                break
+            before = {kind: store.count(kind) for kind in AttackStore.KINDS}
+            stop = min(start + ATTACK_PROGRESS_STEP, n)
+            self._fill_attacks(store, index, range(start, stop))
+            yield stop, before
+
+    def _fill_attacks(self, store, index, attackers=None):
+        """
+        Ajoute à store les attaques des arguments attaquants donnés (tous par
+        défaut)
+        """
+        # 1. Attaques standard (ABA simple) et 2. attaques normales (ABA+)
+        for i, j, bit in self._iter_standard_triples(index, attackers):
+            store.add('standard', i, j, bit)
+            if self._is_normal(index, i, bit):
+                store.add('normal', i, j, bit)
+
+        # 3. Attaques inverses (ABA+)
+        for i, j, x_bit, weak_bit in self._iter_reverse_triples(index, attackers):
+            store.add('reverse', i, j, x_bit, weak_bit)
+
+    def _compute_attacks_parallel(self, arguments, workers, progress=None, budget=None):
+        """
+        Calcule les attaques dans un pool de processus, par tranches
+        d'attaquants. Les données partagées (arguments, contraires,
+        préférences) sont transmises une seule fois à chaque processus ; les
+        tranches sont fusionnées dans l'ordre, comme le calcul séquentiel.
+        A échéance du budget, les tranches restantes sont annulées.
+        """
+        encoding = self.get_encoding()
+        shared_arguments = [
+            encoding.decode_argument(argument) if isinstance(argument[1], int) else argument
+            for argument in arguments
+        ]
+        store = AttackStore([argument[0] for argument in shared_arguments], encoding.assumptions)
+
+        # Plusieurs tranches par processus pour équilibrer la charge
+        n = len(arguments)
+        size = max(1, -(-n // (workers * 4)))
+        shards = [(start, min(start + size, n)) for start in range(0, n, size)]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_attack_worker,
+            initargs=(self.assumptions, self.contraries, self.preferences, shared_arguments)
+        ) as executor:
+            for (_, stop), part in zip(shards, executor.map(_attack_shard, shards)):
+                store.extend(part)
+                if progress is not None:
+                    progress('attacks', stop, n)
+                if budget is not None and stop < n and budget.expired():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    budget.abort('attacks', 'deadline')
+                    break
+
+        return store
+
+    def compute_assumption_attacks(self, budget=None):
+        """
+        Calcule les attaques ABA+ au niveau des ensembles d'assomptions, sans
+        énumérer les arguments
+
+        Pour chaque assomption b de contraire c, on calcule les supports
+        minimaux S dérivant c (MinimalDerivations) :
+        - attaque normale S → {b} si aucune assomption de S n'est moins
+          préférée que b (tout ensemble contenant S attaque tout ensemble
+          contenant b) ;
+        - attaque inverse {b} → S pour les supports minimaux S de c contenant
+          une assomption moins préférée que b.
+        Retourne les supports minimaux de chaque contraire et les deux listes
+        d'attaques, de taille polynomiale en le nombre de supports minimaux.
+
+        Si budget (ComputationBudget) est fourni, les supports sont calculés
+        dans le budget (voir MinimalDerivations) ; à l'interruption, seules
+        les attaques des assomptions déjà traitées sont retournées
+        (budget.partial).
+        """
+        derivations = self.get_derivations()
+        encoding = self.get_encoding()
+        below_masks = self.get_preference_order().below_masks(encoding)
+
+        minimal_supports = {}
+        normal_attacks = []
+        reverse_attacks = []
+
+        for assumption in sorted(self.assumptions):
+            contrary = self.contraries.get(assumption)
+            if contrary is None:
+                continue
+            below = below_masks.get(encoding.bits[assumption], 0)
+
+            supports = derivations.supports(contrary, budget=budget)
+            if budget is not None and budget.partial:
+                break
+            minimal_supports[contrary] = [encoding.decode_support(mask) for mask in supports]
+
+            for mask in supports:
+                if not mask & below:
+                    support = sorted(encoding.decode_support(mask))
+                    normal_attacks.append({
+                        'type': 'normal',
+                        'from': support,
+                        'to': [assumption],
+                        'contrary': contrary,
+                        'description': f"Attaque NORMALE: {{{', '.join(support)}}} → {{{assumption}}} (via '{contrary}'=C('{assumption}'))"
+                    })
+
+            if below:
+                reversed_supports = derivations.supports(contrary, within=below, budget=budget)
+                if budget is not None and budget.partial:
+                    break
+                for mask in reversed_supports:
+                    support = sorted(encoding.decode_support(mask))
+                    weak = sorted(encoding.decode_support(mask & below))
+                    reverse_attacks.append({
+                        'type': 'reverse',
+                        'from': [assumption],
+                        'to': support,
+                        'contrary': contrary,
+                        'weak_assumptions': weak,
+                        'description': f"Attaque INVERSE: {{{assumption}}} → {{{', '.join(support)}}} - '{contrary}'=C('{assumption}') mais {', '.join(weak)} < {assumption}"
+                    })
+
+        return {
+            'minimal_supports': minimal_supports,
+            'normal': normal_attacks,
+            'reverse': reverse_attacks
+        }
+
+    def query_claim(self, claim, minimal=False, budget=None):
+        """
+        Arguments d'une revendication et attaques qui la concernent, sans
+        énumérer les autres arguments du cadre
+
+        Les supports de claim sont construits en arrière à partir des règles
+        (MinimalDerivations, sous-buts tabulés), puis ceux des contraires des
+        assomptions de ces supports (contre-arguments). Les attaques sont
+        celles de compute_all_attacks entre ces seuls arguments : attaques
+        standard et normales des contre-arguments sur les arguments de
+        claim, attaques inverses des arguments de claim sur leurs
+        contre-arguments.
+
+        Retourne (arguments, nombre d'arguments de claim, attaques) : les
+        arguments (conclusion, frozenset) de claim viennent en premier.
+
+        Si budget (ComputationBudget) est fourni, au plus budget.max_arguments
+        arguments sont construits et la durée est vérifiée pendant les
+        dérivations et les attaques ; à l'interruption, les arguments déjà
+        construits et leurs attaques sont retournés (budget.partial).
+        """
+        if claim not in self.language:
+            raise ValueError(f"Symbole inconnu : {claim}")
+        derivations = self.get_derivations(minimal)
+        encoding = self.get_encoding()
+
+        max_arguments = None if budget is None else budget.max_arguments
+        arguments = [(encoding.symbol_id(claim), mask) for mask in derivations.supports(claim, budget=budget)]
+        n_claim = len(arguments)
+
+        attacked = 0
+        for _, mask in arguments:
+            attacked |= mask
+        contraries = [claim]
+        for bit in _iter_bits(attacked):
+            if budget is not None and budget.partial:
+                break
+            contrary = self.contraries.get(encoding.assumptions[bit])
+            if contrary is not None and contrary not in contraries:
+                contraries.append(contrary)
+                arguments.extend((encoding.symbol_id(contrary), mask)
+                                 for mask in derivations.supports(contrary, budget=budget))
+                if max_arguments is not None and len(arguments) > max_arguments:
+                    del arguments[max_arguments:]
+                    budget.abort('query', 'max_arguments')
+
+        attacks = self.compute_all_attacks(arguments, workers=1, budget=budget)
+        return [encoding.decode_argument(argument) for argument in arguments], n_claim, attacks
+
+    def update_arguments(self, previous, previous_arguments, minimal=False):
+        """
+        Met à jour les arguments d'un cadre atomique déjà évalué (previous,
+        dont previous_arguments sont les arguments) après une modification
+
+        Les règles des deux cadres sont comparées : les conclusions des règles
+        ajoutées ou supprimées, ainsi que les assomptions ajoutées ou
+        supprimées, sont invalidées avec tout ce qui en dépend dans le graphe
+        de dépendance. Seuls les arguments des conclusions invalidées sont
+        recalculés ; ceux des autres conclusions sont repris tels quels.
+
+        Les arguments conservés gardent leur ordre relatif et les nouveaux
+        arguments sont ajoutés à la fin. Retourne (arguments, reused) où
+        reused[i] est l'indice de l'argument i dans previous_arguments, ou
+        None pour un argument nouveau.
+        """
+        def rule_set(aba):
+            return {(rule.conclusion, frozenset(rule.premises)) for rule in aba.rules}
+
+        old_rules = rule_set(previous)
+        new_rules = rule_set(self)
+
+        # Symboles modifiés : conclusions des règles ajoutées/supprimées et
+        # assomptions ajoutées/supprimées
+        seeds = {conclusion for conclusion, _ in old_rules ^ new_rules}
+        seeds |= previous.assumptions ^ self.assumptions
+
+        # Propagation vers les conclusions qui en dépendent (dans l'ancien et
+        # le nouveau graphe)
+        consumers = {}
+        for conclusion, premises in old_rules | new_rules:
+            for premise in premises:
+                consumers.setdefault(premise, set()).add(conclusion)
+        dirty = set(seeds)
+        stack = list(seeds)
+        while stack:
+            symbol = stack.pop()
+            for conclusion in consumers.get(symbol, ()):
+                if conclusion not in dirty:
+                    dirty.add(conclusion)
+                    stack.append(conclusion)
+
+        # Sous-cadre : règles des conclusions invalidées, plus une règle
+        # c <- S pour chaque argument conservé (c, S) utilisé comme prémisse
+        old_by_conclusion = {}
+        for argument in previous_arguments:
+            old_by_conclusion.setdefault(argument[0], []).append(argument)
+
+        sub_rules = [rule for rule in self.rules if rule.conclusion in dirty]
+        clean_premises = {
+            premise for rule in sub_rules for premise in rule.premises if premise not in dirty
+        }
+        for premise in sorted(clean_premises):
+            for k, (conclusion, support) in enumerate(old_by_conclusion.get(premise, ())):
+                sub_rules.append(Rule(f"kept_{premise}_{k}", conclusion, sorted(support), self.symbols))
+
+        recomputed = []
+        if dirty:
+            sub_aba = ABAFramework(self.language, self.assumptions, self.contraries, sub_rules,
+                                   symbols=self.symbols)
+            recomputed = [
+                argument for argument in sub_aba.generate_arguments_optimized(minimal=minimal)
+                if argument[0] in dirty
+            ]
+        recomputed_set = set(recomputed)
+
+        arguments = []
+        reused = []
+        for k, argument in enumerate(previous_arguments):
+            if argument[0] not in dirty or argument in recomputed_set:
+                arguments.append(argument)
+                reused.append(k)
+        kept = set(arguments)
+        for argument in recomputed:
+            if argument not in kept:
+                arguments.append(argument)
+                reused.append(None)
+
+        return arguments, reused
+
+    def update_attacks(self, previous, previous_attacks, arguments, reused):
+        """
+        Met à jour les attaques (AttackStore) après update_arguments
+
+        Une attaque entre deux arguments conservés est reprise (avec les
+        nouveaux indices) si l'assomption en jeu a le même contraire et le même
+        ensemble d'assomptions moins préférées qu'avant. Seules sont
+        recalculées les attaques dont l'attaquant ou la cible est un nouvel
+        argument, ou qui passent par une assomption modifiée. Le résultat est
+        identique à compute_all_attacks(arguments).
+        """
+        index = self._build_attack_index(arguments)
+        bits = index['encoding'].bits
+        masks = index['masks']
+        conclusions = index['conclusions']
+        contrary_masks = index['contrary_masks']
+        contrary_by_bit = index['contrary_by_bit']
+        below_masks = index['below_masks']
+        preferred_mask = index['preferred_mask']
+        arguments_by_assumption = index['arguments_by_assumption']
+        arguments_by_conclusion = index['arguments_by_conclusion']
+
+        # Assomptions modifiées : nouveau contraire ou nouvel ordre en dessous
+        order = self.get_preference_order()
+        previous_order = previous.get_preference_order()
+        dirty_bits = {
+            bits[assumption] for assumption in self.assumptions
+            if assumption not in previous.assumptions
+            or self.contraries.get(assumption) != previous.contraries.get(assumption)
+            or order.below.get(assumption, frozenset()) != previous_order.below.get(assumption, frozenset())
+        }
+
+        old_to_new = {old: new for new, old in enumerate(reused) if old is not None}
+        new_ids = [i for i, old in enumerate(reused) if old is None]
+
+        def kept_attacks(kind):
+            # Attaques reprises : (attaquant, cible, bit) avec les nouveaux indices
+            for old_i, old_j, old_bit in zip(previous_attacks.sources[kind],
+                                             previous_attacks.targets[kind],
+                                             previous_attacks.via[kind]):
+                i = old_to_new.get(old_i)
+                j = old_to_new.get(old_j)
+                if i is None or j is None:
+                    continue
+                bit = bits[previous_attacks.assumptions[old_bit]]
+                if bit not in dirty_bits:
+                    yield i, j, bit
+
+        # Attaques standard : triplets (attaquant, cible, bit de l'assomption)
+        standard = set(kept_attacks('standard'))
+        standard.update(self._iter_standard_triples(index, new_ids))
+        for j in new_ids:
+            for bit in _iter_bits(masks[j]):
+                for i in arguments_by_conclusion.get(contrary_by_bit.get(bit), ()):
+                    if i != j:
+                        standard.add((i, j, bit))
+        for bit in dirty_bits:
+            for i in arguments_by_conclusion.get(contrary_by_bit.get(bit), ()):
+                for j in arguments_by_assumption.get(bit, ()):
+                    if i != j:
+                        standard.add((i, j, bit))
+
+        # Attaques inverses : triplets (X, Y, bit de x)
+        reverse = set(kept_attacks('reverse'))
+        reverse.update((i, j, x_bit) for i, j, x_bit, _ in self._iter_reverse_triples(index, new_ids))
+        for j in new_ids:
+            for x_bit in _iter_bits(contrary_masks.get(conclusions[j], 0) & preferred_mask):
+                if masks[j] & below_masks[x_bit]:
+                    for i in arguments_by_assumption.get(x_bit, ()):
+                        if i != j:
+                            reverse.add((i, j, x_bit))
+        for x_bit in dirty_bits:
+            if not (preferred_mask >> x_bit) & 1:
+                continue
+            for j in arguments_by_conclusion.get(contrary_by_bit.get(x_bit), ()):
+                if masks[j] & below_masks[x_bit]:
+                    for i in arguments_by_assumption.get(x_bit, ()):
+                        if i != j:
+                            reverse.add((i, j, x_bit))
+
+        # Même ordre que le calcul complet : attaquant, cible puis assomption
+        store = AttackStore(conclusions, index['encoding'].assumptions)
+        for i, j, bit in sorted(standard):
+            store.add('standard', i, j, bit)
+            if self._is_normal(index, i, bit):
+                store.add('normal', i, j, bit)
+        for i, j, x_bit in sorted(reverse):
+            weak = masks[j] & below_masks[x_bit]
+            store.add('reverse', i, j, x_bit, (weak & -weak).bit_length() - 1)
+
+        return store
+
+    def canonical_key(self):
+        """
+        Retourne une empreinte (SHA-256) du cadre indépendante de l'ordre des
+        lignes et des espaces : langage, assomptions, contraires, règles et
+        préférences sont triés avant hachage
+        """
+        canonical = {
+            'language': sorted(self.language),
+            'assumptions': sorted(self.assumptions),
+            'contraries': sorted(self.contraries.items()),
+            'rules': sorted([rule.name, rule.conclusion, list(rule.premises)] for rule in self.rules),
+            'preferences': sorted(set(self.preferences))
+        }
+        return hashlib.sha256(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def __str__(self):
+        """Représentation textuelle du cadre ABA"""
+        result = f"Langage: {self.language}\n"
+        result += f"Assomptions: {self.assumptions}\n"
+        result += f"Contraires: {self.contraries}\n"
+        result += f"Préférences: {self.preferences}\n"
+        result += "Règles:\n"
+        for rule in self.rules:
+            result += f"  {rule.name}: {rule.conclusion} <- {', '.join(rule.premises) if rule.premises else '∅'}\n"
+        return result
+
+class ParseError(ValueError):
+    """
+    Erreur de syntaxe dans le texte d'un cadre ABA, avec son numéro de ligne
+    """
+    def __init__(self, line_number, message):
+        super().__init__(f"Ligne {line_number} : {message}")
+        self.line_number = line_number
+
+def parse_aba_input(aba_text):
+    """
+    Parse le format ABA et retourne un objet ABAFramework
+
+    Les symboles des règles sont internés dans la table des symboles du
+    cadre (SymbolTable) à la construction des règles (Rule). Une ligne mal formée lève ParseError avec son numéro ; les
+    lignes commençant par '#' sont des commentaires.
+    """
+    symbols = SymbolTable()
+    language = set()
+    assumptions = set()
+    contraries = {}
+    rules = []
+    preferences = []
+
+    def names(text):
+        return [name for name in map(str.strip, text.split(',')) if name]
+
+    def name(text, line_number, what):
+        text = text.strip()
+        if not text:
+            raise ParseError(line_number, f"{what} vide")
+        return text
+    
+    for line_number, line in enumerate(aba_text.split('\n'), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+            
+        if line.startswith('L:'):
+            language = set(names(line[2:].strip(' []')))
+            
+        elif line.startswith('A:'):
+            assumptions = set(names(line[2:].strip(' []')))
+            
+        elif line.startswith('C('):
+            head, separator, contrary = line.partition(':')
+            head = head.rstrip()
+            if not separator or not head.endswith(')'):
+                raise ParseError(line_number, "contraire attendu sous la forme C(a): b")
+            contraries[name(head[2:-1], line_number, "assomption")] = name(contrary, line_number, "contraire")
+            
+        elif line.startswith('['):
+            head, separator, rule_content = line.partition(']:')
+            if not separator:
+                raise ParseError(line_number, "règle attendue sous la forme [nom]: c <- p1, p2")
+            rule_name = name(head[1:], line_number, "nom de règle")
+            conclusion, _, premises = rule_content.partition('<-')
+            rules.append(Rule(rule_name, name(conclusion, line_number, "conclusion"), names(premises), symbols))
+            
+        elif line.startswith('PREF:'):
+            pref_part = line[5:].strip()
+            if '>' not in pref_part:
+                raise ParseError(line_number, "préférence attendue sous la forme a, b > c")
+            # "a,b > c > d" : chaque élément d'un groupe est préféré
+            # à chaque élément du groupe suivant
+            groups = [names(group) for group in pref_part.split('>')]
+            for better_group, worse_group in zip(groups, groups[1:]):
+                for better in better_group:
+                    for worse in worse_group:
+                        preferences.append((better, worse))
+
+        else:
+            raise ParseError(line_number, f"ligne non reconnue : {line}")
+    
+    return ABAFramework(language, assumptions, contraries, rules, preferences, symbols)
+
+# INSTRUMENTATION
+
+class MetricsRegistry:
+    """
+    Métriques agrégées du serveur (compteurs et histogrammes), exportées au
+    format texte de Prometheus
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}    # (nom, étiquettes) -> valeur
+        self._histograms = {}  # (nom, étiquettes) -> [effectifs par seuil, somme, nombre]
+
+    def inc(self, name, labels, amount=1, help_text=''):
+        """
+        Incrémente un compteur
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, ('counter', help_text))
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value, help_text=''):
+        """
+        Ajoute une observation à un histogramme
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, ('histogram', help_text))
+            histogram = self._histograms.setdefault(key, [[0] * len(self.BUCKETS), 0.0, 0])
+            for k, bound in enumerate(self.BUCKETS):
+                if value <= bound:
+                    histogram[0][k] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def observe_stage(self, stage, elapsed, counts):
+        """
+        Enregistre la durée et les compteurs d'une étape de calcul
+        """
+        self.observe('aba_stage_duration_seconds', {'stage': stage}, elapsed,
+                     "Durée des étapes de calcul")
+        for item, value in counts.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                self.inc('aba_stage_items_total', {'stage': stage, 'item': item}, value,
+                         "Eléments traités par étape (règles, arguments, combinaisons, attaques...)")
+
+    def render(self, extra=()):
+        """
+        Retourne les métriques au format texte de Prometheus ; extra est une
+        liste de (nom, type, aide, valeur) ajoutées telles quelles
+        """
+        def format_labels(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ''
+            escaped = [
+                f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+                for k, v in items
+            ]
+            return '{' + ','.join(escaped) + '}'
+
+        lines = []
+        with self._lock:
+            for name in sorted(self._help):
+                kind, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == 'counter':
+                    for (metric, labels), value in sorted(self._counters.items()):
+                        if metric == name:
+                            lines.append(f"{name}{format_labels(labels)} {value}")
+                else:
+                    for (metric, labels), (buckets, total, count) in sorted(self._histograms.items()):
+                        if metric != name:
+                            continue
+                        for bound, bucket_count in zip(self.BUCKETS, buckets):
+                            lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {bucket_count}")
+                        lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {count}")
+                        lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                        lines.append(f"{name}_count{format_labels(labels)} {count}")
+        for name, kind, help_text, value in extra:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+METRICS = MetricsRegistry()
+
+# tracemalloc est global au processus : il reste actif tant qu'au moins une
+# requête mesure ses allocations
+_TRACING_LOCK = threading.Lock()
+_TRACING_USERS = 0
+
+def _start_tracing():
+    global _TRACING_USERS
+    with _TRACING_LOCK:
+        if _TRACING_USERS == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _TRACING_USERS += 1
+
+def _stop_tracing():
+    global _TRACING_USERS
+    with _TRACING_LOCK:
+        _TRACING_USERS -= 1
+        if _TRACING_USERS == 0:
+            tracemalloc.stop()
+
+class StageRecorder:
+    """
+    Mesure des étapes d'une requête : durée, compteurs (règles, arguments,
+    combinaisons essayées, attaques par type...) et, avec trace_memory, pic
+    d'allocations (tracemalloc ; approximatif si plusieurs requêtes mesurent
+    en parallèle). Les durées et compteurs alimentent aussi METRICS.
+
+        with recorder.stage('parse') as counts:
+            ...
+            counts['rules'] = len(rules)
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        counts = {}
+        if self.trace_memory:
+            _start_tracing()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            elapsed = time.perf_counter() - start
+            record = {'stage': name, 'time_s': elapsed, 'counts': counts}
+            if self.trace_memory:
+                record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                _stop_tracing()
+            self.stages.append(record)
+            METRICS.observe_stage(name, elapsed, counts)
+
+    def report(self):
+        """
+        Retourne la section 'timings' d'une réponse
+        """
+        return {
+            'stages': self.stages,
+            'total_s': sum(record['time_s'] for record in self.stages)
+        }
+
+# CACHE DES RÉSULTATS
+
+def estimate_size(obj, _seen=None):
+    """
+    Estime (approximativement) la mémoire occupée par un objet et son contenu
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(estimate_size(getattr(obj, name), _seen) for name in obj.__slots__)
+    return size
+
+class ResultCache:
+    """
+    Cache LRU des résultats de calcul, borné en nombre d'entrées et en
+    mémoire (estimée). Les entrées sont indexées par étape de calcul (cadre
+    atomique, arguments, attaques...) et par l'empreinte canonique du cadre,
+    ce qui permet à une route de réutiliser ce qu'une autre a déjà calculé.
+    """
+    def __init__(self, max_entries=128, max_bytes=128 * 1024 * 1024, store=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store  # ArtifactStore consulté en cas d'absence, ou None
+        self._entries = OrderedDict()  # clé -> (valeur, taille estimée)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Retourne la valeur associée à key (et la marque comme récente)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """
+        Ajoute une entrée puis évince les moins récentes si nécessaire. Une
+        valeur plus grosse que le budget mémoire n'est pas conservée.
+        """
+        if self.max_entries <= 0:
+            return
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, info=None, cacheable=None):
+        """
+        Retourne la valeur en cache, ou la calcule avec compute() et la met en cache
+
+        En l'absence de la valeur en mémoire, elle est cherchée dans store
+        (ArtifactStore) s'il est défini ; une valeur calculée y est ajoutée
+        si son calcul a été assez long (voir ArtifactStore.min_seconds).
+
+        Si info (dictionnaire) est fourni, info['cached'] indique si la valeur
+        provenait du cache. Si cacheable est fourni, la valeur calculée n'est
+        mise en cache que si cacheable() est vrai (résultat partiel, par
+        exemple).
+        """
+        missing = object()
+        value = self.lookup(key, missing)
+        if info is not None:
+            info['cached'] = value is not missing
+        if value is missing:
+            start = time.perf_counter()
+            value = compute()
+            if cacheable is None or cacheable():
+                self.add(key, value, time.perf_counter() - start)
+        return value
+
+    def lookup(self, key, default=None):
+        """
+        Retourne la valeur en mémoire, ou à défaut dans store (elle est alors
+        remise en mémoire)
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing and self.store is not None:
+            value = self.store.get(key, missing)
+            if value is not missing:
+                self.put(key, value)
+        return default if value is missing else value
+
+    def add(self, key, value, elapsed):
+        """
+        Met en cache une valeur calculée en elapsed secondes (et dans store
+        si son calcul a été assez long)
+        """
+        self.put(key, value)
+        if self.store is not None and elapsed >= self.store.min_seconds:
+            self.store.put(key, value)
+
+    def clear(self):
+        """
+        Vide le cache (les compteurs sont conservés)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        Retourne les compteurs du cache
+        """
+        with self._lock:
+            stats = {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+        stats['store'] = self.store.stats() if self.store is not None else None
+        return stats
+
+# Version des algorithmes et du format des résultats : à incrémenter à chaque
+# changement qui modifie les valeurs calculées (ou leurs classes), afin
+# d'invalider les entrées de l'ArtifactStore
+ALGORITHM_VERSION = 1
+
+class ArtifactStore:
+    """
+    Stockage persistant (SQLite) des résultats de calcul, partagé par les
+    processus du serveur et conservé d'un redémarrage à l'autre
+
+    Les entrées sont indexées par l'empreinte SHA-256 de la clé de cache
+    (étape, empreinte canonique du cadre, options) et contiennent la valeur
+    sérialisée (pickle). Chaque entrée porte la version des algorithmes
+    (ALGORITHM_VERSION) : celles d'une autre version sont ignorées, celles
+    d'une version antérieure supprimées. Au-delà de max_bytes, les entrées lues le moins récemment
+    sont évincées. Seules les valeurs dont le calcul a duré au moins
+    min_seconds sont conservées.
+
+    Une erreur d'accès à la base est traitée comme une absence d'entrée :
+    le calcul a alors lieu normalement.
+    """
+    def __init__(self, path, max_bytes=1024 * 1024 * 1024, min_seconds=0.1, version=ALGORITHM_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.min_seconds = min_seconds
+        self.version = version
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connection(self):
+        """
+        Retourne la connexion du thread courant, ouverte à la première
+        utilisation dans chaque processus (une connexion SQLite ne doit pas
+        être réutilisée après un fork)
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # WAL : lectures concurrentes pendant l'écriture d'un autre processus
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS artifacts ('
+                'key TEXT PRIMARY KEY, version INTEGER NOT NULL, value BLOB NOT NULL, '
+                'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed)')
+            # Entrées des versions antérieures (celles d'une version plus récente
+            # appartiennent aux processus déjà mis à jour d'un déploiement)
+            connection.execute('DELETE FROM artifacts WHERE version < ?', (self.version,))
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    @staticmethod
+    def digest(key):
+        """
+        Retourne l'empreinte d'une clé de cache (tuple de chaînes, booléens
+        et entiers)
+        """
+        return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, key, default=None):
+        """
+        Retourne la valeur associée à key (et la marque comme récente)
+        """
+        digest = self.digest(key)
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                'SELECT value FROM artifacts WHERE key = ? AND version = ?', (digest, self.version)
+            ).fetchone()
+            if row is None:
+                with self._lock:
+                    self.misses += 1
+                return default
+            connection.execute('UPDATE artifacts SET accessed = ? WHERE key = ?', (time.time(), digest))
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+            return default
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Entrée illisible (classes modifiées sans changer ALGORITHM_VERSION)
+            with self._lock:
+                self.errors += 1
+            self.discard(key)
+            return default
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Enregistre une valeur puis évince les entrées les moins récentes si
+        la taille totale dépasse max_bytes
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            with self._lock:
+                self.errors += 1
+            return
+        if len(data) > self.max_bytes:
+            return
+
+        try:
+            connection = self._connection()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute(
+                    'INSERT OR REPLACE INTO artifacts (key, version, value, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                    (self.digest(key), self.version, data, len(data), time.time())
+                )
+                evicted = self._evict(connection)
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.writes += 1
+            self.evictions += evicted
+
+    def _evict(self, connection):
+        """
+        Supprime les entrées lues le moins récemment jusqu'à revenir sous
+        max_bytes et retourne leur nombre
+        """
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM artifacts').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = []
+        for digest, size in connection.execute('SELECT key, size FROM artifacts ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((digest,))
+            total -= size
+        connection.executemany('DELETE FROM artifacts WHERE key = ?', evicted)
+        return len(evicted)
+
+    def discard(self, key):
+        """
+        Supprime l'entrée associée à key
+        """
+        try:
+            self._connection().execute('DELETE FROM artifacts WHERE key = ?', (self.digest(key),))
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+
+    def clear(self):
+        """
+        Vide le stockage (les compteurs sont conservés)
+        """
+        try:
+            self._connection().execute('DELETE FROM artifacts')
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+
+    def stats(self):
+        """
+        Retourne l'état du stockage et les compteurs du processus courant
+        """
+        try:
+            entries, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts WHERE version = ?', (self.version,)
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        with self._lock:
+            return {
+                'path': self.path,
+                'version': self.version,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'errors': self.errors
+            }
+
+def arguments_fingerprint(arguments):
+    """
+    Retourne une empreinte de la liste ordonnée des arguments (conclusion,
+    support), indépendante de l'ordre d'itération des supports
+    """
+    digest = hashlib.sha256()
+    for conclusion, support in arguments:
+        digest.update(repr((conclusion, sorted(support))).encode('utf-8'))
+    return digest.hexdigest()
+
+RESULT_CACHE = ResultCache(
+    max_entries=int(os.environ.get('ABA_CACHE_MAX_ENTRIES', 128)),
+    max_bytes=int(os.environ.get('ABA_CACHE_MAX_BYTES', 128 * 1024 * 1024)),
+    # Stockage persistant partagé par les processus, si ABA_STORE_PATH est défini
+    store=ArtifactStore(
+        os.environ['ABA_STORE_PATH'],
+        max_bytes=int(os.environ.get('ABA_STORE_MAX_BYTES', 1024 * 1024 * 1024)),
+        min_seconds=float(os.environ.get('ABA_STORE_MIN_SECONDS', 0.1))
+    ) if os.environ.get('ABA_STORE_PATH') else None
+)
+
+def evaluate_stages(aba_original, transformation, minimal, progress=None, recorder=None, budget=None):
+    """
+    Exécute (ou relit dans le cache) les étapes coûteuses pour un cadre :
+    transformation, arguments et attaques
+
+    transformation vaut 'atomic' (conversion atomique directe) ou
+    'non_circular:<mode>' (transformation non-circulaire puis atomique, en
+    une seule passe : voir ABAFramework.convert_to_non_circular_atomic).
+    Retourne (cadre transformé, cadre atomique, arguments, attaques), le cadre
+    transformé étant None pour la conversion atomique directe.
+
+    progress(stage, done, total), si fourni, est appelé au fil des étapes
+    ('transformation', 'arguments', 'attacks' ; total vaut None s'il n'est
+    pas connu à l'avance). Chaque étape est mesurée par recorder (voir
+    StageRecorder).
+
+    Si budget (ComputationBudget) est fourni, le coût estimé est soumis au
+    contrôle d'admission avant chaque étape coûteuse, puis arguments et
+    attaques sont calculés dans le budget ; un résultat partiel
+    (budget.partial) n'est pas mis en cache.
+    """
+    if recorder is None:
+        recorder = StageRecorder()
+    key = aba_original.canonical_key()
+
+    def complete():
+        return budget is None or not budget.partial
+
+    if transformation == 'atomic':
+        aba_transformed = None
+        with recorder.stage('atomic') as counts:
+            aba_atomic = RESULT_CACHE.get_or_compute(
+                ('atomic', key), aba_original.convert_to_atomic, counts)
+            counts['rules'] = len(aba_atomic.rules)
+    else:
+        mode = transformation.split(':', 1)[1]
+        if budget is not None:
+            with recorder.stage('estimate'):
+                budget.admit({'rules': aba_original.get_non_circular_rules_count()})
+        # Transformation non-circulaire et conversion atomique en une passe
+        with recorder.stage('non_circular_atomic') as counts:
+            aba_transformed, aba_atomic = RESULT_CACHE.get_or_compute(
+                ('non_circular_atomic', key, mode), lambda: aba_original.convert_to_non_circular_atomic(mode),
+                counts)
+            counts['rules'] = len(aba_transformed.rules)
+            counts['atomic_rules'] = len(aba_atomic.rules)
+
+    if progress is not None:
+        progress('transformation', 1, 1)
+
+    if budget is not None:
+        with recorder.stage('estimate'):
+            budget.admit(aba_atomic.estimate_cost())
+
+    def generate_arguments(stats):
+        if progress is None:
+            return aba_atomic.generate_arguments_optimized(minimal=minimal, stats=stats, budget=budget)
+        arguments = []
+        for argument in aba_atomic.iter_arguments(minimal=minimal, stats=stats, budget=budget):
+            arguments.append(argument)
+            if len(arguments) % 1000 == 0:
+                progress('arguments', len(arguments), None)
+        progress('arguments', len(arguments), len(arguments))
+        return arguments
+
+    with recorder.stage('arguments') as counts:
+        arguments = RESULT_CACHE.get_or_compute(
+            ('arguments', key, transformation, minimal), lambda: generate_arguments(counts), counts, complete)
+        counts['arguments'] = len(arguments)
+
+    with recorder.stage('attacks') as counts:
+        if complete():
+            attacks = RESULT_CACHE.get_or_compute(
+                attacks_cache_key(key, transformation, minimal, arguments),
+                lambda: aba_atomic.compute_all_attacks(arguments, progress=progress, budget=budget),
+                counts, complete)
+        else:
+            attacks = aba_atomic.compute_all_attacks(arguments, progress=progress, budget=budget)
+        for kind in AttackStore.KINDS:
+            counts[kind] = attacks.count(kind)
+
+    return aba_transformed, aba_atomic, arguments, attacks
+
+def attacks_cache_key(key, transformation, minimal, arguments):
+    """
+    Clé de cache des attaques entre les arguments d'un cadre (clé canonique
+    key) obtenus par evaluate_stages
+    """
+    attacks_key = ('attacks', key, transformation, minimal)
+    if RESULT_CACHE.store is not None:
+        # L'ordre des arguments dépend du processus qui les a générés
+        # (hachage des chaînes) : les attaques enregistrées par un autre
+        # processus ne valent que pour la même liste d'arguments
+        attacks_key += (arguments_fingerprint(arguments),)
+    return attacks_key
+
+SESSION_STORE = ResultCache(
+    max_entries=int(os.environ.get('ABA_SESSION_MAX_ENTRIES', 64)),
+    max_bytes=int(os.environ.get('ABA_SESSION_MAX_BYTES', 128 * 1024 * 1024))
+)
+
+def session_base(session_id, minimal):
+    """
+    Retourne la dernière version évaluée dans la session si elle peut servir
+    de base à une évaluation incrémentale (même option minimal), None sinon
+    """
+    previous = SESSION_STORE.get(session_id)
+    if previous is None or previous['minimal'] != minimal:
+        return None
+    return previous
+
+def remember_session(session_id, aba_original, minimal, aba_atomic, arguments, attacks):
+    """
+    Conserve le résultat complet d'une évaluation comme dernière version de
+    la session
+    """
+    SESSION_STORE.put(session_id, {
+        'key': aba_original.canonical_key(),
+        'minimal': minimal,
+        'atomic': aba_atomic,
+        'arguments': arguments,
+        'attacks': attacks
+    })
+
+def evaluate_session(aba_original, session_id, minimal, recorder=None, budget=None):
+    """
+    Evalue un cadre (conversion atomique, arguments, attaques) de façon
+    incrémentale par rapport à la dernière version évaluée dans la même
+    session (étapes mesurées par recorder, voir StageRecorder)
+
+    budget ne s'applique qu'à l'évaluation complète (voir evaluate_stages) ;
+    un résultat partiel n'est pas conservé dans la session.
+
+    Retourne (cadre atomique, arguments, attaques, informations) où les
+    informations indiquent le mode utilisé : 'full' (pas de version
+    précédente), 'unchanged' (cadre identique) ou 'incremental'.
+    """
+    if recorder is None:
+        recorder = StageRecorder()
+    key = aba_original.canonical_key()
+    previous = session_base(session_id, minimal)
+
+    if previous is None:
+        _, aba_atomic, arguments, attacks = evaluate_stages(
+            aba_original, 'atomic', minimal, recorder=recorder, budget=budget)
+        info = {'mode': 'full'}
+    elif previous['key'] == key:
+        aba_atomic, arguments, attacks = previous['atomic'], previous['arguments'], previous['attacks']
+        info = {'mode': 'unchanged'}
+    else:
+        with recorder.stage('atomic') as counts:
+            aba_atomic = aba_original.convert_to_atomic()
+            counts['rules'] = len(aba_atomic.rules)
+        with recorder.stage('arguments') as counts:
+            arguments, reused = aba_atomic.update_arguments(previous['atomic'], previous['arguments'], minimal)
+            counts['arguments'] = len(arguments)
+        with recorder.stage('attacks') as counts:
+            attacks = aba_atomic.update_attacks(previous['atomic'], previous['attacks'], arguments, reused)
+            for kind in AttackStore.KINDS:
+                counts[kind] = attacks.count(kind)
+        reused_count = sum(1 for old in reused if old is not None)
+        info = {
+            'mode': 'incremental',
+            'reused_arguments': reused_count,
+            'new_arguments': len(arguments) - reused_count,
+            'removed_arguments': len(previous['arguments']) - reused_count
+        }
+
+    if budget is None or not budget.partial:
+        remember_session(session_id, aba_original, minimal, aba_atomic, arguments, attacks)
+    return aba_atomic, arguments, attacks, info
+
+# MISE EN FORME DES RÉSULTATS
+
+def format_rules(rules):
+    """
+    Met en forme une liste de règles pour la réponse JSON
+    """
+    return [{
+        'name': rule.name,
+        'conclusion': rule.conclusion,
+        'premises': list(rule.premises)
+    } for rule in rules]
+
+def format_framework_info(aba_original):
+    """
+    Met en forme les informations du cadre original
+    """
+    return {
+        'original_language': list(aba_original.language),
+        'original_assumptions': list(aba_original.assumptions),
+        'original_contraries': aba_original.contraries,
+        'preferences': aba_original.preferences,
+        'original_rules': format_rules(aba_original.rules)
+    }
+
+def format_atomic_framework(aba_atomic):
+    """
+    Met en forme les informations du cadre atomique
+    """
+    return {
+        'language': list(aba_atomic.language),
+        'assumptions': list(aba_atomic.assumptions),
+        'contraries': aba_atomic.contraries,
+        'rules_count': len(aba_atomic.rules),
+        'rules': format_rules(aba_atomic.rules)
+    }
+
+def format_argument(i, argument):
+    """
+    Met en forme un argument (conclusion, support) d'indice i
+    """
+    conc, supp = argument
+    return {
+        'id': i,
+        'conclusion': conc,
+        'support': list(supp)
+    }
+
+def format_arguments(arguments):
+    """
+    Met en forme la liste des arguments
+    """
+    return [format_argument(i, argument) for i, argument in enumerate(arguments)]
+
+def format_attack_counts(attacks):
+    """
+    Met en forme le nombre d'attaques de chaque type
+    """
+    return {
+        'standard': len(attacks['standard']),
+        'normal': len(attacks['normal']),
+        'reverse': len(attacks['reverse']),
+        'total_aba_plus': len(attacks['all_aba_plus'])
+    }
+
+def format_attack(attack):
+    """
+    Met en forme une attaque pour la réponse JSON
+    """
+    return {'description': attack['description'], 'from': attack['from'], 'to': attack['to']}
+
+SEMANTICS_TIME_BUDGET = float(os.environ.get('ABA_SEMANTICS_TIME_BUDGET', 10))
+SEMANTICS_MAX_EXTENSIONS = int(os.environ.get('ABA_SEMANTICS_MAX_EXTENSIONS', 1000))
+
+def get_semantics_option(data):
+    """
+    Lit l'option 'semantics' d'une requête : liste (ou chaîne séparée par
+    des virgules) de sémantiques parmi ExtensionSemantics.SEMANTICS
+    """
+    names = data.get('semantics') or []
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+    for name in names:
+        if name not in ExtensionSemantics.SEMANTICS:
+            raise ValueError(f"Sémantique inconnue : {name}")
+    return names
+
+def format_semantics(arguments, attacks, semantics_names):
+    """
+    Calcule les extensions demandées sur le graphe d'attaques ABA+
+    """
+    semantics = ExtensionSemantics.from_attacks(attacks, len(arguments))
+    return semantics.compute(semantics_names, SEMANTICS_TIME_BUDGET, SEMANTICS_MAX_EXTENSIONS)
+
+def get_response_format(data):
+    """
+    Lit l'option 'format' d'une requête : 'full' (par défaut, une entrée par
+    attaque avec sa description) ou 'compact' (tableaux d'entiers)
+    """
+    response_format = data.get('format', 'full')
+    if response_format not in ('full', 'compact'):
+        raise ValueError(f"Format de réponse inconnu : {response_format}")
+    return response_format
+
+def get_timings_option(data):
+    """
+    Lit l'option 'timings' d'une requête : si elle est vraie, la réponse
+    contient une section 'timings' (durée, compteurs et pic d'allocations de
+    chaque étape, voir StageRecorder)
+    """
+    return bool(data.get('timings', False))
+
+def format_attack_details(attacks, response_format='full'):
+    """
+    Met en forme le détail des attaques de chaque type
+
+    Au format compact, les attaques sont envoyées sous forme de tableaux
+    parallèles (voir AttackStore.to_arrays) sans description.
+    """
+    if response_format == 'compact':
+        return attacks.to_arrays()
+    return {
+        'standard': [format_attack(a) for a in attacks['standard']],
+        'normal': [format_attack(a) for a in attacks['normal']],
+        'reverse': [format_attack(a) for a in attacks['reverse']]
+    }
+
+def to_ndjson(record):
+    """
+    Sérialise un enregistrement en une ligne JSON (format NDJSON)
+    """
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+# ÉVALUATION DES REQUÊTES
+
+def parse_framework(aba_text, recorder):
+    """
+    Analyse le texte d'un cadre (étape 'parse' de recorder)
+    """
+    with recorder.stage('parse') as counts:
+        aba_original = parse_aba_input(aba_text)
+        counts['rules'] = len(aba_original.rules)
+        counts['assumptions'] = len(aba_original.assumptions)
+    return aba_original
+
+def compute_semantics(arguments, attacks, semantics_names, recorder):
+    """
+    Calcule les extensions demandées (étape 'semantics' de recorder)
+    """
+    with recorder.stage('semantics') as counts:
+        semantics = format_semantics(arguments, attacks, semantics_names)
+        counts['extensions'] = sum(len(entry.get('extensions', [])) for entry in semantics.values())
+    return semantics
+
+def run_process(data, progress=None):
+    """
+    Calcule la réponse de /process pour les données d'une requête (voir
+    evaluate_stages pour progress)
+    """
+    aba_text = data.get('aba_text', '')
+    minimal = bool(data.get('minimal_arguments', False))
+    response_format = get_response_format(data)
+    semantics_names = get_semantics_option(data)
+    session_id = data.get('session_id')
+    timings = get_timings_option(data)
+    recorder = StageRecorder(trace_memory=timings)
+    budget = ComputationBudget.from_options(data.get('budget'))
+    
+    # Parse input
+    aba_original = parse_framework(aba_text, recorder)
+    
+    # Check circularity
+    with recorder.stage('circularity') as counts:
+        is_circular = aba_original.is_circular()
+        circular_dependencies = aba_original.get_circular_dependencies() if is_circular else []
+        counts['circular_dependencies'] = len(circular_dependencies)
+    
+    # Apply atomic conversion if not circular
+    if not is_circular:
+        # Atomic conversion, arguments and attacks (cached, or updated
+        # from the previous version of the session)
+        if session_id:
+            aba_atomic, arguments, attacks, incremental = evaluate_session(
+                aba_original, session_id, minimal, recorder, budget)
+        else:
+            _, aba_atomic, arguments, attacks = evaluate_stages(
+                aba_original, 'atomic', minimal, progress, recorder, budget)
+            incremental = None
+        
+    else:
+        # If circular, we can't generate arguments/attacks
+        aba_atomic = None
+        arguments = []
+        attacks = AttackStore()
+        incremental = None
+    
+    # Format response
+    with recorder.stage('formatting'):
+        result = {
+            'success': True,
+            'minimal_arguments': minimal,
+            'format': response_format,
+            'is_circular': is_circular,
+            'circular_dependencies': circular_dependencies,
+            'arguments': format_arguments(arguments),
+            'attacks': format_attack_counts(attacks),
+            'attack_details': format_attack_details(attacks, response_format),
+            'framework_info': format_framework_info(aba_original),
+            'atomic_framework': format_atomic_framework(aba_atomic) if aba_atomic is not None else None
+        }
+    if semantics_names:
+        result['semantics'] = compute_semantics(arguments, attacks, semantics_names, recorder)
+    if session_id:
+        result['session_id'] = session_id
+        result['incremental'] = incremental
+    if budget.partial:
+        result['partial'] = True
+    if 'budget' in data or budget.partial:
+        result['budget'] = budget.report()
+    if timings:
+        result['timings'] = recorder.report()
+    
+    return result
+
+def run_transform_non_circular(data, progress=None):
+    """
+    Calcule la réponse de /transform_non_circular pour les données d'une
+    requête (voir evaluate_stages pour progress)
+    """
+    aba_text = data.get('aba_text', '')
+    minimal = bool(data.get('minimal_arguments', False))
+    response_format = get_response_format(data)
+    semantics_names = get_semantics_option(data)
+    mode = data.get('non_circular_mode', 'full')
+    timings = get_timings_option(data)
+    recorder = StageRecorder(trace_memory=timings)
+    budget = ComputationBudget.from_options(data.get('budget'))
+    
+    # Parse input
+    aba_original = parse_framework(aba_text, recorder)
+    
+    # Apply non-circular transformation, then atomic conversion to the
+    # transformed framework, arguments and attacks (cached)
+    aba_transformed, aba_atomic, arguments, attacks = evaluate_stages(
+        aba_original, f'non_circular:{mode}', minimal, progress, recorder, budget)
+    
+    # Format transformation info
+    if mode == 'scc':
+        unfolding = aba_original.get_cyclic_unfolding()
+        non_assumption_language = {s for members, _ in unfolding for s in members}
+        k_value = max((k for _, k in unfolding), default=0)
+    else:
+        unfolding = None
+        non_assumption_language = aba_original.language - aba_original.assumptions
+        k_value = len(non_assumption_language)
+
+    full_language_size, full_rules_count = aba_original.get_non_circular_full_size()
+    
+    transformation_info = {
+        'transformation_type': 'non_circular',
+        'mode': mode,
+        'k_value': k_value,
+        'non_assumptions': list(non_assumption_language),
+        'size_report': {
+            'components': [{'symbols': members, 'k': k} for members, k in unfolding] if unfolding is not None else None,
+            'full_language_size': full_language_size,
+            'full_rules_count': full_rules_count,
+            'language_saved': full_language_size - len(aba_transformed.language),
+            'rules_saved': full_rules_count - len(aba_transformed.rules)
+        },
+        'original_language_size': len(aba_original.language),
+        'transformed_language_size': len(aba_transformed.language),
+        'original_rules_count': len(aba_original.rules),
+        'transformed_rules_count': len(aba_transformed.rules),
+        'original_assumptions': list(aba_original.assumptions),
+        'transformed_assumptions': list(aba_transformed.assumptions),
+        'original_rules': format_rules(aba_original.rules),
+        'transformed_rules': format_rules(aba_transformed.rules)
+    }
+    
+    # Format response
+    with recorder.stage('formatting'):
+        result = {
+            'success': True,
+            'minimal_arguments': minimal,
+            'format': response_format,
+            'transformation_type': 'non_circular',
+            'is_circular': False,  # After transformation, it's no longer circular
+            'arguments': format_arguments(arguments),
+            'attacks': format_attack_counts(attacks),
+            'attack_details': format_attack_details(attacks, response_format),
+            'framework_info': format_framework_info(aba_original),
+            'atomic_framework': format_atomic_framework(aba_atomic),
+            'transformation_info': transformation_info
+        }
+    if semantics_names:
+        result['semantics'] = compute_semantics(arguments, attacks, semantics_names, recorder)
+    if budget.partial:
+        result['partial'] = True
+    if 'budget' in data or budget.partial:
+        result['budget'] = budget.report()
+    if timings:
+        result['timings'] = recorder.report()
+    
+    return result
+
+def run_transform_atomic(data, progress=None):
+    """
+    Calcule la réponse de /transform_atomic pour les données d'une requête (voir
+    evaluate_stages pour progress)
+    """
+    aba_text = data.get('aba_text', '')
+    minimal = bool(data.get('minimal_arguments', False))
+    response_format = get_response_format(data)
+    semantics_names = get_semantics_option(data)
+    timings = get_timings_option(data)
+    recorder = StageRecorder(trace_memory=timings)
+    budget = ComputationBudget.from_options(data.get('budget'))
+    
+    # Parse input
+    aba_original = parse_framework(aba_text, recorder)
+    
+    # Keep original circularity status
+    with recorder.stage('circularity'):
+        is_circular = aba_original.is_circular()
+    
+    # Apply atomic conversion directly (even if circular), then arguments
+    # and attacks (cached, shared with /process)
+    _, aba_atomic, arguments, attacks = evaluate_stages(
+        aba_original, 'atomic', minimal, progress, recorder, budget)
+    
+    # Format transformation info for atomic conversion
+    transformation_info = {
+        'transformation_type': 'atomic',
+        'original_language_size': len(aba_original.language),
+        'atomic_language_size': len(aba_atomic.language),
+        'original_assumptions_count': len(aba_original.assumptions),
+        'atomic_assumptions_count': len(aba_atomic.assumptions),
+        'original_rules_count': len(aba_original.rules),
+        'atomic_rules_count': len(aba_atomic.rules),
+        'new_assumptions': list(aba_atomic.assumptions - aba_original.assumptions)
+    }
+    
+    # Format response
+    with recorder.stage('formatting'):
+        result = {
+            'success': True,
+            'minimal_arguments': minimal,
+            'format': response_format,
+            'transformation_type': 'atomic',
+            'is_circular': is_circular,
+            'arguments': format_arguments(arguments),
+            'attacks': format_attack_counts(attacks),
+            'attack_details': format_attack_details(attacks, response_format),
+            'framework_info': format_framework_info(aba_original),
+            'atomic_framework': format_atomic_framework(aba_atomic),
+            'transformation_info': transformation_info
+        }
+    if semantics_names:
+        result['semantics'] = compute_semantics(arguments, attacks, semantics_names, recorder)
+    if budget.partial:
+        result['partial'] = True
+    if 'budget' in data or budget.partial:
+        result['budget'] = budget.report()
+    if timings:
+        result['timings'] = recorder.report()
+    
+    return result
+
+def run_query(data, progress=None):
+    """
+    Calcule la réponse de /query : arguments de la revendication data['claim']
+    et attaques qui la concernent (voir ABAFramework.query_claim)
+    """
+    aba_text = data.get('aba_text', '')
+    claim = data.get('claim')
+    if not isinstance(claim, str) or not claim.strip():
+        raise ValueError("Paramètre 'claim' manquant")
+    claim = claim.strip()
+    minimal = bool(data.get('minimal_arguments', False))
+    response_format = get_response_format(data)
+    timings = get_timings_option(data)
+    budget = ComputationBudget.from_options(data.get('budget'))
+    recorder = StageRecorder(trace_memory=timings)
+
+    # Parse input
+    aba_original = parse_framework(aba_text, recorder)
+
+    # Arguments and attacks of the claim (cached, unless partial)
+    with recorder.stage('query') as counts:
+        arguments, n_claim, attacks = RESULT_CACHE.get_or_compute(
+            ('query', aba_original.canonical_key(), claim, minimal),
+            lambda: aba_original.query_claim(claim, minimal, budget),
+            cacheable=lambda: not budget.partial)
+        counts['arguments'] = len(arguments)
+        counts['attacks'] = len(attacks['all_aba_plus'])
+
+    # Format response
+    with recorder.stage('formatting'):
+        result = {
+            'success': True,
+            'claim': claim,
+            'minimal_arguments': minimal,
+            'format': response_format,
+            'is_circular': aba_original.is_circular(),
+            'claim_arguments': list(range(n_claim)),
+            'arguments': format_arguments(arguments),
+            'attacks': format_attack_counts(attacks),
+            'attack_details': format_attack_details(attacks, response_format),
+            'framework_info': format_framework_info(aba_original)
+        }
+    if budget.partial:
+        result['partial'] = True
+    if 'budget' in data or budget.partial:
+        result['budget'] = budget.report()
+    if timings:
+        result['timings'] = recorder.report()
+
+    return result
+
+# Opérations d'évaluation, par nom (route synchrone correspondante)
+OPERATIONS = {
+    'process': run_process,
+    'query': run_query,
+    'transform_atomic': run_transform_atomic,
+    'transform_non_circular': run_transform_non_circular
+}
@@ -1,572 +1,634 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+import atexit
+import gzip
+import json
+import multiprocessing
 import os
-from itertools import product
+import pickle
+import queue
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import aba_core
+from aba_core import (
+    AttackStore,
+    BudgetExceeded,
+    ComputationBudget,
+    METRICS,
+    OPERATIONS,
+    RESULT_CACHE,
+    StageRecorder,
+    attacks_cache_key,
+    evaluate_session,
+    format_argument,
+    format_atomic_framework,
+    format_attack,
+    format_attack_counts,
+    format_framework_info,
+    get_timings_option,
+    parse_aba_input,
+    parse_framework,
+    remember_session,
+    run_process,
+    run_query,
+    run_transform_atomic,
+    run_transform_non_circular,
+    session_base,
+    to_ndjson
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Encodages optionnels des réponses (voir encode_result)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # INITIALISATION DE FLASK EN PREMIER
 app = Flask(__name__)
 
-class ABAFramework:
-    def __init__(self, language=None, assumptions=None, contraries=None, rules=None, preferences=None):
-        self.language = language or set()
-        self.assumptions = assumptions or set()
-        self.contraries = contraries or {}
-        self.rules = rules or []
-        self.preferences = preferences or []
-        
-    def convert_to_atomic(self):
+# ENCODAGE DES RÉPONSES
+
+# Taille (octets) à partir de laquelle une réponse est compressée
+COMPRESSION_THRESHOLD = int(os.environ.get('ABA_COMPRESSION_THRESHOLD', 16 * 1024))
+COMPRESSION_LEVEL = int(os.environ.get('ABA_COMPRESSION_LEVEL', 5))
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+def encode_json(result):
+    """
+    Sérialise un résultat en JSON compact (orjson s'il est installé), clés
+    triées comme avec jsonify
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass  # Entier hors de 64 bits, par exemple
+    return json.dumps(result, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def encode_result(result):
+    """
+    Construit la réponse d'un résultat selon les en-têtes de la requête :
+    - Accept : JSON (par défaut) ou MessagePack (application/msgpack, si
+      le module msgpack est installé)
+    - Accept-Encoding : gzip ou deflate au-delà de COMPRESSION_THRESHOLD
+    La sérialisation et la compression sont mesurées dans METRICS.
+    """
+    start = time.perf_counter()
+    mimetypes = ['application/json']
+    if msgpack is not None:
+        mimetypes += MSGPACK_MIMETYPES
+    mimetype = request.accept_mimetypes.best_match(mimetypes, default='application/json')
+    if mimetype in MSGPACK_MIMETYPES:
+        body = msgpack.packb(result, use_bin_type=True)
+    else:
+        body = encode_json(result)
+    METRICS.observe_stage('serialization', time.perf_counter() - start, {'bytes': len(body)})
+
+    response = Response(body, mimetype=mimetype)
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if len(body) >= COMPRESSION_THRESHOLD:
+        start = time.perf_counter()
+        if 'gzip' in request.accept_encodings:
+            response.set_data(gzip.compress(body, compresslevel=COMPRESSION_LEVEL))
+            response.headers['Content-Encoding'] = 'gzip'
+        elif 'deflate' in request.accept_encodings:
+            response.set_data(zlib.compress(body, COMPRESSION_LEVEL))
+            response.headers['Content-Encoding'] = 'deflate'
+        else:
+            return response
+        METRICS.observe_stage('compression', time.perf_counter() - start, {'bytes': response.content_length})
+    return response
+
+# TÂCHES ASYNCHRONES
+
+def _run_job(operation, data, connection, memory_limit):
+    """
+    Corps du processus d'une tâche : applique la limite mémoire, exécute
+    l'opération et envoie la progression puis le résultat par connection
+    """
+    # Gestionnaires hérités du worker du serveur (gunicorn ignore SIGTERM
+    # dans ses workers) : terminate() doit arrêter la tâche
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    def progress(stage, done, total):
+        connection.send(('progress', {'stage': stage, 'done': done, 'total': total}))
+
+    try:
+        connection.send(('result', OPERATIONS[operation](data, progress)))
+    except MemoryError:
+        connection.send(('error', "Limite mémoire dépassée"))
+    except Exception as e:
+        connection.send(('error', str(e)))
+    finally:
+        connection.close()
+
+class JobQueueFull(Exception):
+    """
+    Levée quand la file d'attente des tâches est pleine
+    """
+
+class JobElsewhere(Exception):
+    """
+    Levée pour une tâche d'un autre processus du serveur quand l'état des
+    tâches n'est pas partagé (voir JobStore)
+    """
+
+class JobStore:
+    """
+    Etat des tâches partagé (SQLite) par les processus du serveur : un état
+    ou une annulation demandés à n'importe quel worker concernent la tâche
+    quel que soit le processus qui l'exécute. Le résultat d'une tâche
+    terminée y est conservé (pickle) ; l'annulation y est enregistrée et
+    relevée par le processus qui exécute la tâche.
+    """
+    FIELDS = ('id', 'operation', 'status', 'progress', 'error', 'submitted_at', 'started_at', 'finished_at')
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
         """
-        Convertit le cadre ABA en version atomique sensible
-        Remplace chaque littéral non-assomption dans le corps des règles
-        par une nouvelle assomption s_d et ajoute une règle s_d <- s
+        Retourne la connexion du thread courant (voir ArtifactStore._connection)
         """
-        atomic_aba = ABAFramework()
-        
-        # Étape 1: Créer le nouveau langage
-        # On garde le langage original et on ajoute les nouvelles assomptions
-        new_language = set(self.language)
-        new_assumptions = set(self.assumptions)
-        
-        # Dictionnaire pour mapper les littéraux non-assomptions vers leurs nouvelles assomptions
-        literal_to_new_assumption = {}
-        new_rules = []
-        
-        # Étape 2: Identifier tous les littéraux non-assomptions qui apparaissent dans les corps de règles
-        non_assumption_literals_in_bodies = set()
-        
-        for rule in self.rules:
-            for premise in rule['premises']:
-                if premise not in self.assumptions:
-                    non_assumption_literals_in_bodies.add(premise)
-        
-        # Étape 3: Créer de nouvelles assomptions pour chaque littéral non-assomption
-        for literal in non_assumption_literals_in_bodies:
-            new_assumption_d = f"{literal}_d"  # _d pour "dérivé"
-            literal_to_new_assumption[literal] = new_assumption_d
-            new_language.add(new_assumption_d)
-            new_assumptions.add(new_assumption_d)
-
-            new_assumption_nd = f"{literal}_nd"  # _nd pour "non-dérivé"
-            new_language.add(new_assumption_nd)
-            new_assumptions.add(new_assumption_nd)
-            
-        # Étape 4: Transformer les règles originales
-        for rule in self.rules:
-            new_premises = []
-            
-            for premise in rule['premises']:
-                if premise in self.assumptions:
-                    # Garder les assomptions originales
-                    new_premises.append(premise)
-                else:
-                    # Remplacer les littéraux non-assomptions par leurs nouvelles assomptions
-                    new_premises.append(literal_to_new_assumption[premise])
-            
-            new_rules.append({
-                'name': f"atom_{rule['name']}",
-                'conclusion': rule['conclusion'],
-                'premises': new_premises
-            })
-        
-        # Étape 5: Mettre à jour les contraires
-        new_contraries = self.contraries.copy()
-        for literal in non_assumption_literals_in_bodies:
-            new_assumption_d = f"{literal}_d"
-            new_assumption_nd = f"{literal}_nd"
-            
-            # Contraire de _d est _nd
-            new_contraries[new_assumption_d] = new_assumption_nd
-            # Contraire de _nd est le littéral original
-            new_contraries[new_assumption_nd] = literal
-            
-        # Étape 6: Construire le nouveau cadre atomique
-        atomic_aba.language = new_language
-        atomic_aba.assumptions = new_assumptions
-        atomic_aba.contraries = new_contraries
-        atomic_aba.rules = new_rules
-        atomic_aba.preferences = self.preferences.copy()
-        
-        return atomic_aba
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, operation TEXT NOT NULL, status TEXT NOT NULL, progress TEXT, '
+                'error TEXT, submitted_at REAL, started_at REAL, finished_at REAL, result BLOB)'
+            )
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
 
-    def get_contrary(self, assumption):
+    def insert(self, job):
         """
-        Retourne le contraire d'une assomption
+        Enregistre une nouvelle tâche (état retourné par JobManager._snapshot)
         """
-        return self.contraries.get(assumption)
+        self._connection().execute(
+            f'INSERT INTO jobs ({", ".join(self.FIELDS)}) VALUES ({", ".join("?" * len(self.FIELDS))})',
+            [json.dumps(job[field]) if field == 'progress' else job[field] for field in self.FIELDS]
+        )
 
-    def is_circular(self):
+    def update(self, job_id, statuses=None, **fields):
         """
-        Détermine si le cadre ABA contient des circularités dans les règles
-        Retourne True si circulaire, False sinon
+        Met à jour les champs d'une tâche (seulement si son état est dans
+        statuses, s'il est fourni) ; retourne True si la tâche a été modifiée
         """
-        # Construire le graphe de dépendance entre les conclusions
-        dependency_graph = {}
-        
-        # Initialiser le graphe avec tous les symboles du langage
-        for symbol in self.language:
-            dependency_graph[symbol] = set()
-        
-        # Ajouter les dépendances basées sur les règles
-        for rule in self.rules:
-            conclusion = rule['conclusion']
-            premises = rule['premises']
-            
-            for premise in premises:
-                # Inclure TOUTES les prémisses, même les assomptions
-                dependency_graph[conclusion].add(premise)
-        
-        # Vérifier tous les cycles avec un algorithme complet
-        def find_all_cycles():
-            cycles = []
-            visited = set()
-            
-            def dfs(node, path, path_set):
-                if node in path_set:
-                    # Cycle détecté !
-                    cycle_start = path.index(node)
-                    cycle = path[cycle_start:]
-                    # Vérifier si c'est un nouveau cycle
-                    cycle_tuple = tuple(sorted(cycle))
-                    if cycle_tuple not in cycles:
-                        cycles.append(cycle_tuple)
-                    return
-                
-                if node in visited:
-                    return
-                
-                visited.add(node)
-                path.append(node)
-                path_set.add(node)
-                
-                for neighbor in dependency_graph[node]:
-                    dfs(neighbor, path, path_set)
-                
-                path.pop()
-                path_set.remove(node)
-            
-            # Pour chaque nœud, lancer une recherche DFS complète
-            for node in sorted(dependency_graph.keys()):
-                if node not in visited:
-                    dfs(node, [], set())
-            
-            return cycles
-        
-        cycles = find_all_cycles()
-        
-        if cycles:
-            return True
-        else:
-            return False
-    
-    def get_circular_dependencies(self):
+        values = []
+        for field, value in fields.items():
+            if field == 'progress':
+                value = json.dumps(value)
+            elif field == 'result':
+                value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            values.append(value)
+        query = f'UPDATE jobs SET {", ".join(f"{field} = ?" for field in fields)} WHERE id = ?'
+        values.append(job_id)
+        if statuses is not None:
+            query += f' AND status IN ({", ".join("?" * len(statuses))})'
+            values.extend(statuses)
+        return self._connection().execute(query, values).rowcount > 0
+
+    def get(self, job_id):
         """
-        Retourne toutes les circularités détectées dans le cadre ABA
-        Version corrigée pour trouver tous les cycles
+        Retourne l'état d'une tâche, ou None
         """
-        # Construire le graphe de dépendance
-        dependency_graph = {}
-        for symbol in self.language:
-            dependency_graph[symbol] = set()
-        
-        for rule in self.rules:
-            conclusion = rule['conclusion']
-            premises = rule['premises']
-            
-            for premise in premises:
-                # Inclure toutes les prémisses
-                dependency_graph[conclusion].add(premise)
-        
-        # Fonction pour trouver tous les cycles
-        def find_all_cycles():
-            cycles = []
-            visited = set()
-            
-            def dfs(node, path, path_set):
-                if node in path_set:
-                    # Cycle détecté
-                    cycle_start = path.index(node)
-                    cycle = path[cycle_start:]
-                    # Vérifier si c'est un cycle valide (pas un doublon)
-                    if len(cycle) >= 2:
-                        cycle_tuple = tuple(sorted(cycle))
-                        if cycle_tuple not in cycles:
-                            cycles.append(cycle_tuple)
-                    return
-                
-                if node in visited:
-                    return
-                
-                visited.add(node)
-                path.append(node)
-                path_set.add(node)
-                
-                for neighbor in dependency_graph[node]:
-                    dfs(neighbor, path, path_set)
-                
-                path.pop()
-                path_set.remove(node)
-            
-            for node in sorted(dependency_graph.keys()):
-                if node not in visited:
-                    dfs(node, [], set())
-            
-            return [list(cycle) for cycle in cycles]
-        
-        cycles = find_all_cycles()
-        
-        return cycles
+        return self.result(job_id)[0]
 
-    def convert_to_non_circular(self):
+    def result(self, job_id, with_result=False):
         """
-        Transforme un ABA circulaire en ABA non-circulaire selon la définition exacte
+        Retourne (état, résultat) d'une tâche, ou (None, None) ; le résultat
+        n'est lu qu'avec with_result
         """
-        # Étape 1: Calculer k = |L \ A|
-        non_assumption_language = self.language - self.assumptions
-        k = len(non_assumption_language)
-        
-        # Étape 2: Créer les nouveaux éléments de langage
-        new_language = set(self.language)  # L° = L ∪ {s^j}
-        new_assumptions = set(self.assumptions)
-        new_contraries = self.contraries.copy()
-        new_rules = []
-        
-        # Dictionnaire pour mapper les symboles à leurs nouvelles versions
-        symbol_mapping = {}
-        
-        # Créer des symboles distincts pour TOUTES les versions s^j, y compris s^1
-        for s in self.language:
-            for j in range(1, k + 1):
-                new_symbol = f"{s}_{j}"  # Toujours créer s_1, s_2, s_3, etc.
-                symbol_mapping[(s, j)] = new_symbol
-                new_language.add(new_symbol)
-                
-                # Les nouvelles versions s^j deviennent des assomptions si s ∉ A
-                if s in non_assumption_language:
-                    new_assumptions.add(new_symbol)
-                    if s in self.contraries:
-                        new_contraries[new_symbol] = self.contraries[s]
-        
-        # Étape 3: Traiter les règles
-        rule_counter = 0
-        
-        for rule in self.rules:
-            s = rule['conclusion']
-            premises = rule['premises']
-            
-            if not premises:  # Règle atomique
-                # Créer k versions s^j ← pour j=1 à k
-                for j in range(1, k + 1):
-                    new_conclusion = symbol_mapping[(s, j)]
-                    new_rules.append({
-                        'name': f"r_{rule_counter}",
-                        'conclusion': new_conclusion,
-                        'premises': []
-                    })
-                    rule_counter += 1
-                        
-            else:  # Règle non-atomique
-                # Créer k-1 versions s^j ← p'^1, ..., p'^n pour j=2 à k
-                for j in range(2, k + 1):
-                    new_conclusion = symbol_mapping[(s, j)]
-                    new_premises = []
-                    
-                    for p in premises:
-                        if p in self.assumptions:
-                            # p' = p (garder l'assomption originale)
-                            new_premises.append(p)
-                        else:
-                            # p' = p^{j-1}
-                            new_premise = symbol_mapping[(p, j-1)]
-                            new_premises.append(new_premise)
-                    
-                    new_rules.append({
-                        'name': f"r_{rule_counter}",
-                        'conclusion': new_conclusion,
-                        'premises': new_premises
-                    })
-                    rule_counter += 1
-        
-        # Étape 4: Créer le nouveau cadre ABA non-circulaire
-        non_circular_aba = ABAFramework()
-        non_circular_aba.language = new_language
-        non_circular_aba.assumptions = new_assumptions
-        non_circular_aba.contraries = new_contraries
-        non_circular_aba.rules = new_rules
-        non_circular_aba.preferences = self.preferences.copy()
-        
-        return non_circular_aba
+        columns = self.FIELDS + (('result',) if with_result else ())
+        row = self._connection().execute(
+            f'SELECT {", ".join(columns)} FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        job = dict(zip(self.FIELDS, row))
+        job['progress'] = json.loads(job['progress']) if job['progress'] is not None else None
+        result = row[-1] if with_result else None
+        return job, pickle.loads(result) if result is not None else None
 
-    def generate_arguments_optimized(self, max_iterations=100):
+    def evict(self, statuses, retention):
         """
-        Version optimisée avec limite d'itérations pour éviter les boucles infinies
+        Oublie les tâches terminées (état dans statuses) les plus anciennes
+        au-delà de retention
         """
-        arguments = []
-        
-        # Arguments de base : chaque assomption est un argument pour elle-même
-        for assumption in self.assumptions:
-            arguments.append((assumption, {assumption}))
-        
-        iteration = 0
-        changed = True
-        
-        while changed and iteration < max_iterations:
-            changed = False
-            iteration += 1
-            
-            current_args = arguments.copy()
-            
-            for rule in self.rules:
-                conclusion = rule['conclusion']
-                premises = rule['premises']
-                
-                # Vérifier si on peut appliquer la règle
-                valid_combinations = self._find_valid_combinations(premises, current_args)
-                
-                for support_args in valid_combinations:
-                    # Calculer le support complet
-                    full_support = set()
-                    for arg in support_args:
-                        full_support.update(arg[1])
-                    
-                    new_arg = (conclusion, frozenset(full_support))
-                    
-                    if new_arg not in arguments:
-                        arguments.append(new_arg)
-                        changed = True
-        
-        return arguments
+        self._connection().execute(
+            f'DELETE FROM jobs WHERE id IN (SELECT id FROM jobs WHERE status IN ({", ".join("?" * len(statuses))}) '
+            'ORDER BY finished_at DESC LIMIT -1 OFFSET ?)',
+            (*statuses, retention)
+        )
+
+class JobManager:
+    """
+    Exécution asynchrone des évaluations longues
+
+    Les tâches sont placées dans une file bornée et traitées par un nombre
+    fixe de fils d'exécution ; chaque tâche s'exécute dans son propre
+    processus, ce qui permet de lui imposer une limite de temps et de mémoire
+    et de l'annuler à tout moment. Le processus transmet sa progression
+    (étape, éléments traités, total) puis son résultat. Seules les
+    `retention` dernières tâches terminées sont conservées.
 
-    def _find_valid_combinations(self, premises, arguments):
+    Chaque worker du serveur a sa propre file. Avec store (JobStore), l'état
+    des tâches est partagé : l'état, le résultat et l'annulation d'une tâche
+    sont accessibles depuis n'importe quel worker. Sans store, seul le
+    processus qui a reçu la tâche la connaît : l'identifiant commence par
+    son pid et les requêtes reçues par un autre processus lèvent
+    JobElsewhere.
+    """
+    FINISHED = ('done', 'failed', 'timeout', 'cancelled')
+    # Intervalle (secondes) de vérification des annulations demandées à un
+    # autre processus
+    CANCEL_POLL_INTERVAL = 0.5
+
+    def __init__(self, workers=2, queue_size=16, time_limit=600, memory_limit=0, retention=100, store=None):
+        self.workers = workers
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.retention = retention
+        self.store = store
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._jobs = OrderedDict()  # identifiant -> tâche
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _ensure_started(self):
         """
-        Trouve les combinaisons valides d'arguments qui satisfont toutes les prémisses
+        Démarre les fils d'exécution à la première soumission (après le fork
+        éventuel des workers du serveur)
         """
-        if not premises:
-            return [[]]  # Une combinaison vide pour les règles sans prémisses
-        
-        # Grouper les arguments par conclusion
-        args_by_conclusion = {}
-        for arg in arguments:
-            if arg[0] not in args_by_conclusion:
-                args_by_conclusion[arg[0]] = []
-            args_by_conclusion[arg[0]].append(arg)
-        
-        # Vérifier que toutes les prémisses peuvent être satisfaites
-        for premise in premises:
-            if premise not in args_by_conclusion:
-                return []  # Impossible de satisfaire cette prémisse
-        
-        # Générer toutes les combinaisons possibles
-        premise_args = [args_by_conclusion[p] for p in premises]
-        combinations = []
-        
-        for combo in product(*premise_args):
-            combinations.append(list(combo))
-        
-        return combinations
+        if self._threads:
+            return
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.shutdown)
 
-    def add_preference(self, better, worse):
+    def submit(self, operation, data):
         """
-        Ajoute une préférence: better > worse
+        Ajoute une tâche à la file et retourne son état. Lève ValueError pour
+        une opération inconnue et JobQueueFull si la file est pleine.
         """
-        if better not in self.assumptions or worse not in self.assumptions:
-            raise ValueError("Les préférences ne peuvent être définies que entre assomptions")
-        
-        self.preferences.append((better, worse))
-    
-    def get_preference_relation(self, assumption1, assumption2):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Opération inconnue : {operation}")
+
+        job = {
+            'id': f'{os.getpid():x}-{uuid.uuid4().hex}',
+            'operation': operation,
+            'status': 'queued',
+            'progress': None,
+            'error': None,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'data': data,
+            'result': None,
+            'process': None
+        }
+        with self._lock:
+            self._ensure_started()
+            try:
+                self._queue.put_nowait(job['id'])
+            except queue.Full:
+                raise JobQueueFull("File d'attente des tâches pleine, réessayez plus tard")
+            self._jobs[job['id']] = job
+            if self.store is not None:
+                self.store.insert(self._snapshot(job))
+            return self._snapshot(job)
+
+    def _local_job(self, job_id):
         """
-        Retourne la relation de préférence entre deux assomptions
-        Retourne: 1 si assumption1 > assumption2, -1 si assumption2 > assumption1, 0 sinon
+        Retourne la tâche job_id de ce processus, ou None (JobElsewhere si
+        elle a été soumise à un autre processus et que l'état n'est pas
+        partagé)
         """
-        if (assumption1, assumption2) in self.preferences:
-            return 1
-        elif (assumption2, assumption1) in self.preferences:
-            return -1
-        else:
-            return 0
+        job = self._jobs.get(job_id)
+        if job is None and self.store is None and '-' in job_id \
+                and job_id.split('-', 1)[0] != f'{os.getpid():x}':
+            raise JobElsewhere(
+                "Tâche soumise à un autre processus du serveur : les tâches nécessitent "
+                "un seul worker, un routage par tâche ou ABA_JOB_STORE_PATH"
+            )
+        return job
 
-    def compute_standard_attacks(self, arguments):
+    def get(self, job_id):
         """
-        Calcule les attaques standard ABA (sans préférences)
+        Retourne l'état d'une tâche (sans son résultat), ou None
         """
-        attacks = []
-        
-        for i, (conc1, supp1) in enumerate(arguments):
-            for j, (conc2, supp2) in enumerate(arguments):
-                if i == j:
-                    continue  # Un argument n'attaque pas lui-même
-                    
-                # Vérifier chaque assomption dans le support de l'argument cible
-                for assumption in supp2:
-                    contrary = self.get_contrary(assumption)
-                    if contrary == conc1:
-                        attacks.append({
-                            'type': 'standard',
-                            'from': i,
-                            'to': j,
-                            'via_assumption': assumption,
-                            'description': f"Argument {i} ({conc1}) attaque Argument {j} via l'assomption '{assumption}'"
-                        })
-        
-        return attacks
+        if self.store is not None:
+            return self.store.get(job_id)
+        with self._lock:
+            job = self._local_job(job_id)
+            return self._snapshot(job) if job is not None else None
 
-    def compute_normal_attacks(self, arguments, standard_attacks):
+    def result(self, job_id):
         """
-        Calcule les attaques NORMALES ABA+
+        Retourne (état, résultat) d'une tâche, ou (None, None)
         """
-        normal_attacks = []
-        
-        for attack in standard_attacks:
-            attacker_idx = attack['from']
-            target_idx = attack['to']
-            target_assumption = attack['via_assumption']
-            
-            attacker_arg = arguments[attacker_idx]
-            _, attacker_support = attacker_arg
-            
-            # Vérifier si l'attaque est valide selon les préférences
-            attack_valid = True
-            
-            for assump in attacker_support:
-                # Si une assomption de l'attaquant est strictement moins préférée que la cible
-                if self.get_preference_relation(assump, target_assumption) == -1:
-                    attack_valid = False
-                    break
-            
-            if attack_valid:
-                normal_attacks.append({
-                    'type': 'normal',
-                    'from': attacker_idx,
-                    'to': target_idx,
-                    'via_assumption': target_assumption,
-                    'description': f"Attaque NORMALE: Argument {attacker_idx} → Argument {target_idx} (via '{target_assumption}')"
-                })
-        
-        return normal_attacks
+        if self.store is not None:
+            return self.store.result(job_id, with_result=True)
+        with self._lock:
+            job = self._local_job(job_id)
+            if job is None:
+                return None, None
+            return self._snapshot(job), job['result']
 
-    def compute_reverse_attacks(self, arguments):
+    def cancel(self, job_id):
         """
-        Calcule les attaques INVERSES selon la définition stricte ABA+
+        Annule une tâche en attente ou en cours et retourne son état, ou None
         """
-        reverse_attacks = []
-        
-        for i, (conc_i, supp_i) in enumerate(arguments):  # X = supp_i
-            for j, (conc_j, supp_j) in enumerate(arguments):  # Y = supp_j
-                if i == j:
-                    continue
-                    
-                # Vérifier si Y (argument j) a un argument qui attaque X (argument i)
-                for x in supp_i:  # x ∈ X
-                    contrary_x = self.get_contrary(x)
-                    if contrary_x and contrary_x == conc_j:  # Y conclut ¯x
-                        # Maintenant vérifier la condition de préférence faible
-                        for y_prime in supp_j:  # y' ∈ Y' ⊆ Y
-                            if self.get_preference_relation(y_prime, x) == -1:  # y' < x
-                                reverse_attacks.append({
-                                    'type': 'reverse',
-                                    'from': i,  # X attaque Y
-                                    'to': j,    # Y est attaqué
-                                    'target_assumption': x,  # L'assomption ciblée dans X
-                                    'weak_assumption': y_prime,  # L'assomption faible dans Y
-                                    'description': f"Attaque INVERSE: Argument {i} (X) → Argument {j} (Y) - Y attaque X via '{conc_j}'=C('{x}') mais y'='{y_prime}' < x='{x}'"
-                                })
-                                break  # Une seule assomption faible suffit
-        
-        return reverse_attacks
+        if self.store is not None:
+            # Le processus qui exécute la tâche relève l'annulation (voir _execute)
+            self.store.update(job_id, ('queued', 'running'), status='cancelled', finished_at=time.time())
+        with self._lock:
+            job = self._jobs.get(job_id) if self.store is not None else self._local_job(job_id)
+            if job is not None and job['status'] not in self.FINISHED:
+                job['status'] = 'cancelled'
+                job['finished_at'] = time.time()
+                job['data'] = None
+                if job['process'] is not None:
+                    job['process'].terminate()
+            if self.store is not None:
+                return self.store.get(job_id)
+            return self._snapshot(job) if job is not None else None
 
-    def compute_all_attacks(self, arguments):
+    def shutdown(self):
         """
-        Calcule tous les types d'attaques selon la définition stricte ABA+
+        Arrête les processus des tâches en cours
         """
-        # 1. Attaques standard (ABA simple) - pour référence
-        standard_attacks = self.compute_standard_attacks(arguments)
-        
-        # 2. Attaques normales (ABA+)
-        normal_attacks = self.compute_normal_attacks(arguments, standard_attacks)
-        
-        # 3. Attaques inverses (ABA+)
-        reverse_attacks = self.compute_reverse_attacks(arguments)
-        
-        # Combiner toutes les attaques ABA+
-        all_attacks = normal_attacks + reverse_attacks
-        
+        with self._lock:
+            for job in self._jobs.values():
+                if job['process'] is not None:
+                    job['process'].terminate()
+
+    def _snapshot(self, job):
         return {
-            'standard': standard_attacks,
-            'normal': normal_attacks, 
-            'reverse': reverse_attacks,
-            'all_aba_plus': all_attacks
+            key: job[key] for key in
+            ('id', 'operation', 'status', 'progress', 'error', 'submitted_at', 'started_at', 'finished_at')
         }
 
-    def __str__(self):
-        """Représentation textuelle du cadre ABA"""
-        result = f"Langage: {self.language}\n"
-        result += f"Assomptions: {self.assumptions}\n"
-        result += f"Contraires: {self.contraries}\n"
-        result += f"Préférences: {self.preferences}\n"
-        result += "Règles:\n"
-        for rule in self.rules:
-            result += f"  {rule['name']}: {rule['conclusion']} <- {', '.join(rule['premises']) if rule['premises'] else '∅'}\n"
-        return result
-
-def parse_aba_input(aba_text):
-    """
-    Parse le format ABA et retourne un objet ABAFramework
-    """
-    language = set()
-    assumptions = set()
-    contraries = {}
-    rules = []
-    preferences = []
-    
-    lines = aba_text.strip().split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.startswith('L:'):
-            items = line[2:].strip(' []').split(',')
-            language = set(item.strip() for item in items)
-            
-        elif line.startswith('A:'):
-            items = line[2:].strip(' []').split(',')
-            assumptions = set(item.strip() for item in items)
-            
-        elif line.startswith('C('):
-            parts = line.split(':')
-            assumption = parts[0][2:-1].strip()
-            contrary = parts[1].strip()
-            contraries[assumption] = contrary
-            
-        elif line.startswith('[') and ']:' in line:
-            parts = line.split(']:')
-            rule_name = parts[0][1:].strip()
-            rule_content = parts[1].strip()
-            
-            if '<-' in rule_content:
-                conclusion, premises = rule_content.split('<-')
-                conclusion = conclusion.strip()
-                premises = [p.strip() for p in premises.split(',') if p.strip()]
+    def _worker_loop(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._execute(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, job_id):
+        """
+        Exécute une tâche dans un processus dédié et suit sa progression
+        """
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != 'queued':
+                return  # Annulée entre-temps
+            started_at = time.time()
+            if self.store is not None and not self.store.update(
+                    job_id, ('queued',), status='running', started_at=started_at):
+                del self._jobs[job_id]  # Annulée par un autre processus
+                return
+            process = multiprocessing.Process(
+                target=_run_job, args=(job['operation'], job['data'], sender, self.memory_limit)
+            )
+            job['status'] = 'running'
+            job['started_at'] = started_at
+            job['process'] = process
+            process.start()
+        sender.close()
+
+        deadline = time.monotonic() + self.time_limit
+        next_check = time.monotonic() + self.CANCEL_POLL_INTERVAL
+        outcome = None
+        while outcome is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                process.terminate()
+                outcome = ('timeout', f"Limite de temps dépassée ({self.time_limit} s)")
+            elif receiver.poll(min(remaining, self.CANCEL_POLL_INTERVAL)):
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    break  # Processus terminé sans résultat
+                if kind == 'progress':
+                    with self._lock:
+                        job['progress'] = payload
+                    if self.store is not None:
+                        self.store.update(job_id, ('running',), progress=payload)
+                else:
+                    outcome = (kind, payload)
+            elif not process.is_alive():
+                break
+            if self.store is not None and outcome is None and time.monotonic() >= next_check:
+                # Annulation demandée à un autre processus
+                next_check = time.monotonic() + self.CANCEL_POLL_INTERVAL
+                state = self.store.get(job_id)
+                if state is None or state['status'] == 'cancelled':
+                    with self._lock:
+                        job['status'] = 'cancelled'
+                    process.terminate()
+                    break
+        process.join()
+        receiver.close()
+
+        with self._lock:
+            job['process'] = None
+            job['data'] = None
+            if job['status'] == 'running':
+                job['finished_at'] = time.time()
+                if outcome is None:
+                    job['status'] = 'failed'
+                    job['error'] = f"Processus interrompu (code {process.exitcode})"
+                elif outcome[0] == 'result':
+                    job['status'] = 'done'
+                    job['result'] = outcome[1]
+                else:
+                    job['status'] = 'timeout' if outcome[0] == 'timeout' else 'failed'
+                    job['error'] = outcome[1]
+                if self.store is not None:
+                    self.store.update(job_id, ('running',), status=job['status'], error=job['error'],
+                                      finished_at=job['finished_at'], result=job['result'])
+            if self.store is not None:
+                # L'état est conservé dans store
+                del self._jobs[job_id]
+                self.store.evict(self.FINISHED, self.retention)
             else:
-                conclusion = rule_content.strip()
-                premises = []
-                
-            rules.append({
-                'name': rule_name,
-                'conclusion': conclusion,
-                'premises': premises
-            })
-            
-        elif line.startswith('PREF:'):
-            pref_part = line[5:].strip()
-            if '>' in pref_part:
-                better, worse = pref_part.split('>')
-                preferences.append((better.strip(), worse.strip()))
-    
-    return ABAFramework(language, assumptions, contraries, rules, preferences)
+                self._evict()
+
+    def _evict(self):
+        """
+        Oublie les tâches terminées les plus anciennes au-delà de retention
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in self.FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
+
+# Etat des tâches partagé par les workers (par défaut dans le stockage
+# persistant des résultats, s'il est configuré)
+JOB_STORE_PATH = os.environ.get('ABA_JOB_STORE_PATH', os.environ.get('ABA_STORE_PATH'))
+
+JOB_MANAGER = JobManager(
+    workers=int(os.environ.get('ABA_JOB_WORKERS', 2)),
+    queue_size=int(os.environ.get('ABA_JOB_QUEUE_SIZE', 16)),
+    time_limit=float(os.environ.get('ABA_JOB_TIME_LIMIT', 600)),
+    memory_limit=int(os.environ.get('ABA_JOB_MEMORY_LIMIT', 2 * 1024 * 1024 * 1024)),
+    retention=int(os.environ.get('ABA_JOB_RETENTION', 100)),
+    store=JobStore(JOB_STORE_PATH) if JOB_STORE_PATH else None
+)
+
+# ÉVALUATION PAR LOTS
+
+BATCH_WORKERS = int(os.environ.get('ABA_BATCH_WORKERS', os.cpu_count() or 1))
+BATCH_MAX_ITEMS = int(os.environ.get('ABA_BATCH_MAX_ITEMS', 1000))
+
+def _run_batch_item(operation, data):
+    """
+    Evalue un élément d'un lot et retourne (succès, résultat ou message
+    d'erreur) : une erreur n'interrompt pas le reste du lot
+    """
+    try:
+        return True, OPERATIONS[operation](data)
+    except Exception as e:
+        return False, str(e)
+
+def _init_batch_worker():
+    """
+    Initialisation d'un processus du pool des lots : les éléments sont déjà
+    répartis entre les processus (pas de calcul parallèle des attaques,
+    comme aba_cli) et terminate() doit pouvoir l'arrêter (voir _run_job)
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    aba_core.ATTACK_WORKERS = 1
+
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def _get_batch_pool():
+    """
+    Retourne le pool de processus des lots (BATCH_WORKERS processus), créé
+    à la première utilisation dans le processus du serveur et partagé par
+    tous les lots
+    """
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            _batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, initializer=_init_batch_worker)
+            atexit.register(_batch_pool.shutdown, wait=False, cancel_futures=True)
+        return _batch_pool
+
+def _discard_batch_pool(executor):
+    """
+    Oublie un pool inutilisable (processus perdu) : le suivant sera recréé
+    """
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is executor:
+            _batch_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_batch(texts, options, operation='process', workers=None):
+    """
+    Evalue une liste de cadres avec les mêmes options (pipeline de la route
+    synchrone de l'opération, voir OPERATIONS) et produit, dans l'ordre
+    des entrées, (indice, indice de la première occurrence, succès, résultat
+    ou message d'erreur)
+
+    Les textes identiques ne sont évalués qu'une fois. Les textes distincts
+    sont soumis dès l'appel au pool de BATCH_WORKERS processus partagé par
+    les lots (voir _get_batch_pool) ; avec workers <= 1 (un seul texte
+    distinct, par défaut), ou si le pool est indisponible, ils sont évalués
+    ici, dans l'ordre, en profitant du cache des résultats.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Opération inconnue : {operation}")
+    first = {}  # texte -> indice de sa première occurrence
+    for index, text in enumerate(texts):
+        first.setdefault(text, index)
+    if workers is None:
+        workers = min(BATCH_WORKERS, len(first))
+
+    outcomes = {}  # texte -> (succès, résultat)
+
+    def evaluate(text):
+        if text not in outcomes:
+            outcomes[text] = _run_batch_item(operation, dict(options, aba_text=text))
+        return outcomes[text]
+
+    executor = None
+    futures = {}
+    if workers > 1:
+        try:
+            executor = _get_batch_pool()
+            for text in first:
+                futures[text] = executor.submit(_run_batch_item, operation, dict(options, aba_text=text))
+        except (OSError, BrokenProcessPool):
+            # Processus indisponibles : évaluation séquentielle du reste
+            if executor is not None:
+                _discard_batch_pool(executor)
+
+    def results():
+        try:
+            for index, text in enumerate(texts):
+                future = futures.get(text)
+                if future is not None and text not in outcomes:
+                    try:
+                        outcomes[text] = future.result()
+                    except (OSError, BrokenProcessPool):
+                        _discard_batch_pool(executor)  # Processus perdu : évalué ici
+                yield (index, first[text]) + evaluate(text)
+        finally:
+            # Lot interrompu : les éléments restants ne sont pas évalués
+            for future in futures.values():
+                future.cancel()
+
+    return results()
 
 # ROUTES FLASK
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    labels = {'endpoint': endpoint, 'status': str(response.status_code)}
+    METRICS.inc('aba_requests_total', labels, help_text="Requêtes traitées par route et code de retour")
+    if 'request_start' in g:
+        METRICS.observe('aba_request_duration_seconds', {'endpoint': endpoint},
+                        time.perf_counter() - g.request_start, "Durée des requêtes par route")
+    return response
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -574,194 +636,261 @@ def index():
 @app.route('/process', methods=['POST'])
 def process():
     try:
-        aba_text = request.json.get('aba_text', '')
+        return encode_result(run_process(request.json))
         
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/process_stream', methods=['POST'])
+def process_stream():
+    """
+    Variante de /process qui envoie les résultats au fur et à mesure, au
+    format NDJSON (un objet JSON par ligne) :
+    - {'type': 'framework', ...} : informations du cadre (comme /process)
+    - {'type': 'argument', 'id', 'conclusion', 'support'} pour chaque argument
+    - {'type': 'attack', 'kind', 'from', 'to', 'description'} pour chaque
+      attaque (par tranches d'attaquants, puis par type)
+    - {'type': 'done', 'arguments', 'attacks'} : bilan final (avec
+      'partial', 'budget', 'session_id', 'incremental' et 'timings' comme
+      /process)
+    - {'type': 'error', 'error'} en cas d'erreur
+
+    Avec 'session_id', le cadre est évalué de façon incrémentale par rapport
+    à la dernière version de la session (voir evaluate_session) puis envoyé ;
+    sans version précédente utilisable, il est envoyé au fur et à mesure du
+    calcul et conservé dans la session.
+
+    L'analyse du cadre, sa conversion atomique et le contrôle d'admission du
+    budget (voir ComputationBudget) ont lieu avant l'envoi : leurs erreurs
+    sont retournées avec le statut 400 (413 pour un budget dépassé), sous la
+    forme d'un seul enregistrement 'error'. Arguments et attaques sont
+    ensuite calculés dans le budget ; un résultat partiel n'est pas mis en
+    cache.
+
+    Le cadre atomique, les arguments et les attaques sont partagés avec
+    /process par RESULT_CACHE : en cas de présence dans le cache, le résultat
+    est envoyé tel quel ; sinon il est envoyé au fur et à mesure du calcul,
+    puis mis en cache.
+
+    Les étapes sont mesurées comme celles de /process (StageRecorder, voir
+    /metrics) ; la durée des étapes 'arguments' et 'attacks' inclut l'envoi
+    de leurs enregistrements.
+    """
+    data = request.json
+    aba_text = data.get('aba_text', '')
+    minimal = bool(data.get('minimal_arguments', False))
+    session_id = data.get('session_id')
+    timings = get_timings_option(data)
+    recorder = StageRecorder(trace_memory=timings)
+
+    def error_response(error, status):
+        return Response(to_ndjson({
+            'type': 'error',
+            'success': False,
+            'error': str(error)
+        }), status=status, mimetype='application/x-ndjson')
+
+    try:
+        budget = ComputationBudget.from_options(data.get('budget'))
+
         # Parse input
-        aba_original = parse_aba_input(aba_text)
-        
+        aba_original = parse_framework(aba_text, recorder)
+        key = aba_original.canonical_key()
+
         # Check circularity
-        is_circular = aba_original.is_circular()
-        circular_dependencies = aba_original.get_circular_dependencies() if is_circular else []
-        
-        # Apply atomic conversion if not circular
-        if not is_circular:
-            aba_atomic = aba_original.convert_to_atomic()
-            
-            # Generate arguments
-            arguments = aba_atomic.generate_arguments_optimized()
-            
-            # Compute attacks
-            attacks = aba_atomic.compute_all_attacks(arguments)
-            
-            # Format atomic framework info
-            atomic_framework = {
-                'language': list(aba_atomic.language),
-                'assumptions': list(aba_atomic.assumptions),
-                'contraries': aba_atomic.contraries,
-                'rules_count': len(aba_atomic.rules),
-                'rules': [{
-                    'name': rule['name'],
-                    'conclusion': rule['conclusion'],
-                    'premises': rule['premises']
-                } for rule in aba_atomic.rules]
-            }
-        else:
-            # If circular, we can't generate arguments/attacks
-            aba_atomic = None
+        with recorder.stage('circularity') as counts:
+            is_circular = aba_original.is_circular()
+            circular_dependencies = aba_original.get_circular_dependencies() if is_circular else []
+            counts['circular_dependencies'] = len(circular_dependencies)
+
+        aba_atomic = None
+        evaluated = None  # (arguments, attacks) déjà calculés
+        incremental = None
+        if not is_circular and session_id and session_base(session_id, minimal) is not None:
+            # Mise à jour de la version précédente de la session
+            aba_atomic, arguments, attacks, incremental = evaluate_session(
+                aba_original, session_id, minimal, recorder, budget)
+            evaluated = (arguments, attacks)
+        elif not is_circular:
+            with recorder.stage('atomic') as counts:
+                aba_atomic = RESULT_CACHE.get_or_compute(
+                    ('atomic', key), aba_original.convert_to_atomic, counts)
+                counts['rules'] = len(aba_atomic.rules)
+            with recorder.stage('estimate'):
+                budget.admit(aba_atomic.estimate_cost())
+            if session_id:
+                incremental = {'mode': 'full'}
+
+    except BudgetExceeded as e:
+        return error_response(e, 413)
+    except Exception as e:
+        return error_response(e, 400)
+
+    def argument_record(i, argument):
+        record = format_argument(i, argument)
+        record['type'] = 'argument'
+        return to_ndjson(record)
+
+    def attack_records(attacks, before):
+        # Attaques ajoutées à attacks depuis before (nombre par type)
+        for kind in AttackStore.KINDS:
+            for k in range(before[kind], attacks.count(kind)):
+                record = format_attack(attacks.attack(kind, k))
+                record['type'] = 'attack'
+                record['kind'] = kind
+                yield to_ndjson(record)
+
+    def generate():
+        try:
+            yield to_ndjson({
+                'type': 'framework',
+                'success': True,
+                'minimal_arguments': minimal,
+                'is_circular': is_circular,
+                'circular_dependencies': circular_dependencies,
+                'framework_info': format_framework_info(aba_original),
+                'atomic_framework': format_atomic_framework(aba_atomic) if aba_atomic is not None else None
+            })
+
             arguments = []
-            attacks = {
-                'standard': [],
-                'normal': [],
-                'reverse': [],
-                'all_aba_plus': []
+            attacks = AttackStore()
+
+            if evaluated is not None:
+                # Résultat de la session, envoyé tel quel
+                arguments, attacks = evaluated
+                for i, argument in enumerate(arguments):
+                    yield argument_record(i, argument)
+                yield from attack_records(attacks, dict.fromkeys(AttackStore.KINDS, 0))
+            elif aba_atomic is not None:
+                # Arguments du cache, ou au fur et à mesure de leur découverte
+                arguments_key = ('arguments', key, 'atomic', minimal)
+                with recorder.stage('arguments') as counts:
+                    cached = RESULT_CACHE.lookup(arguments_key)
+                    counts['cached'] = cached is not None
+                    if cached is not None:
+                        arguments = cached
+                        for i, argument in enumerate(arguments):
+                            yield argument_record(i, argument)
+                    else:
+                        start = time.perf_counter()
+                        for argument in aba_atomic.iter_arguments(minimal=minimal, stats=counts, budget=budget):
+                            arguments.append(argument)
+                            yield argument_record(len(arguments) - 1, argument)
+                        if not budget.partial:
+                            RESULT_CACHE.add(arguments_key, arguments, time.perf_counter() - start)
+                    counts['arguments'] = len(arguments)
+
+                # Puis les attaques (du cache, ou tranche par tranche)
+                attacks_key = attacks_cache_key(key, 'atomic', minimal, arguments)
+                with recorder.stage('attacks') as counts:
+                    cached = None if budget.partial else RESULT_CACHE.lookup(attacks_key)
+                    counts['cached'] = cached is not None
+                    if cached is not None:
+                        attacks = cached
+                        yield from attack_records(attacks, dict.fromkeys(AttackStore.KINDS, 0))
+                    else:
+                        start = time.perf_counter()
+                        for attacks, before in aba_atomic.iter_attack_chunks(arguments, budget):
+                            yield from attack_records(attacks, before)
+                        if not budget.partial:
+                            RESULT_CACHE.add(attacks_key, attacks, time.perf_counter() - start)
+                    for kind in AttackStore.KINDS:
+                        counts[kind] = attacks.count(kind)
+
+                if session_id and not budget.partial:
+                    remember_session(session_id, aba_original, minimal, aba_atomic, arguments, attacks)
+
+            done = {
+                'type': 'done',
+                'arguments': len(arguments),
+                'attacks': format_attack_counts(attacks)
             }
-            atomic_framework = None
-        
-        # Format response
-        result = {
-            'success': True,
-            'is_circular': is_circular,
-            'circular_dependencies': circular_dependencies,
-            'arguments': [
-                {
-                    'id': i,
-                    'conclusion': conc,
-                    'support': list(supp)
-                }
-                for i, (conc, supp) in enumerate(arguments)
-            ],
-            'attacks': {
-                'standard': len(attacks['standard']),
-                'normal': len(attacks['normal']),
-                'reverse': len(attacks['reverse']),
-                'total_aba_plus': len(attacks['all_aba_plus'])
-            },
-            'attack_details': {
-                'standard': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['standard']],
-                'normal': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['normal']],
-                'reverse': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['reverse']]
-            },
-            'framework_info': {
-                'original_language': list(aba_original.language),
-                'original_assumptions': list(aba_original.assumptions),
-                'original_contraries': aba_original.contraries,
-                'preferences': aba_original.preferences,
-                'original_rules': [{
-                    'name': rule['name'],
-                    'conclusion': rule['conclusion'],
-                    'premises': rule['premises']
-                } for rule in aba_original.rules]
-            },
-            'atomic_framework': atomic_framework
-        }
-        
-        return jsonify(result)
-        
+            if session_id:
+                done['session_id'] = session_id
+                done['incremental'] = incremental
+            if budget.partial:
+                done['partial'] = True
+            if 'budget' in data or budget.partial:
+                done['budget'] = budget.report()
+            if timings:
+                done['timings'] = recorder.report()
+            yield to_ndjson(done)
+
+        except Exception as e:
+            yield to_ndjson({
+                'type': 'error',
+                'success': False,
+                'error': str(e)
+            })
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/process_batch', methods=['POST'])
+def process_batch():
+    """
+    Evalue une liste de cadres ('frameworks', textes) avec des options
+    communes ('options', celles de /process) et une même opération
+    ('operation' : 'process' par défaut, 'query', 'transform_atomic' ou
+    'transform_non_circular'). Les résultats sont envoyés dans l'ordre des
+    entrées, au format NDJSON :
+    - {'type': 'result', 'index', 'result'} : réponse de la route synchrone
+    - {'type': 'error', 'index', 'error'} : erreur propre à cet élément
+      (les éléments identiques portent en plus 'duplicate_of')
+    - {'type': 'done', 'count', 'distinct', 'errors'} : bilan final
+    """
+    try:
+        texts = request.json.get('frameworks')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError("'frameworks' doit être une liste de textes")
+        if len(texts) > BATCH_MAX_ITEMS:
+            raise ValueError(f"Lot trop grand : {len(texts)} cadres (maximum {BATCH_MAX_ITEMS})")
+        options = dict(request.json.get('options') or {})
+        options.pop('session_id', None)  # Pas de session pour les lots
+        results = iter_batch(texts, options, request.json.get('operation', 'process'))
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
 
+    def generate():
+        errors = 0
+        for index, first_index, success, value in results:
+            if success:
+                record = {'type': 'result', 'index': index, 'result': value}
+            else:
+                errors += 1
+                record = {'type': 'error', 'index': index, 'success': False, 'error': value}
+            if first_index != index:
+                record['duplicate_of'] = first_index
+            yield to_ndjson(record)
+        yield to_ndjson({
+            'type': 'done',
+            'count': len(texts),
+            'distinct': len(set(texts)),
+            'errors': errors
+        })
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/transform_non_circular', methods=['POST'])
 def transform_non_circular():
     try:
-        aba_text = request.json.get('aba_text', '')
-        
-        # Parse input
-        aba_original = parse_aba_input(aba_text)
-        
-        # Apply non-circular transformation
-        aba_transformed = aba_original.convert_to_non_circular()
-        
-        # Apply atomic conversion to transformed framework
-        aba_atomic = aba_transformed.convert_to_atomic()
-        
-        # Generate arguments
-        arguments = aba_atomic.generate_arguments_optimized()
-        
-        # Compute attacks
-        attacks = aba_atomic.compute_all_attacks(arguments)
-        
-        # Format transformation info
-        non_assumption_language = aba_original.language - aba_original.assumptions
-        k_value = len(non_assumption_language)
-        
-        transformation_info = {
-            'k_value': k_value,
-            'non_assumptions': list(non_assumption_language),
-            'original_language_size': len(aba_original.language),
-            'transformed_language_size': len(aba_transformed.language),
-            'original_rules_count': len(aba_original.rules),
-            'transformed_rules_count': len(aba_transformed.rules),
-            'original_assumptions': list(aba_original.assumptions),
-            'transformed_assumptions': list(aba_transformed.assumptions),
-            'original_rules': [{
-                'name': rule['name'],
-                'conclusion': rule['conclusion'],
-                'premises': rule['premises']
-            } for rule in aba_original.rules],
-            'transformed_rules': [{
-                'name': rule['name'],
-                'conclusion': rule['conclusion'],
-                'premises': rule['premises']
-            } for rule in aba_transformed.rules]
-        }
-        
-        # Format atomic framework info
-        atomic_framework = {
-            'language': list(aba_atomic.language),
-            'assumptions': list(aba_atomic.assumptions),
-            'contraries': aba_atomic.contraries,
-            'rules_count': len(aba_atomic.rules),
-            'rules': [{
-                'name': rule['name'],
-                'conclusion': rule['conclusion'],
-                'premises': rule['premises']
-            } for rule in aba_atomic.rules]
-        }
-        
-        # Format response
-        result = {
-            'success': True,
-            'transformation_type': 'non_circular',
-            'is_circular': False,  # After transformation, it's no longer circular
-            'arguments': [
-                {
-                    'id': i,
-                    'conclusion': conc,
-                    'support': list(supp)
-                }
-                for i, (conc, supp) in enumerate(arguments)
-            ],
-            'attacks': {
-                'standard': len(attacks['standard']),
-                'normal': len(attacks['normal']),
-                'reverse': len(attacks['reverse']),
-                'total_aba_plus': len(attacks['all_aba_plus'])
-            },
-            'attack_details': {
-                'standard': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['standard']],
-                'normal': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['normal']],
-                'reverse': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['reverse']]
-            },
-            'framework_info': {
-                'original_language': list(aba_original.language),
-                'original_assumptions': list(aba_original.assumptions),
-                'original_contraries': aba_original.contraries,
-                'preferences': aba_original.preferences,
-                'original_rules': [{
-                    'name': rule['name'],
-                    'conclusion': rule['conclusion'],
-                    'premises': rule['premises']
-                } for rule in aba_original.rules]
-            },
-            'atomic_framework': atomic_framework,
-            'transformation_info': transformation_info
-        }
-        
-        return jsonify(result)
+        return encode_result(run_transform_non_circular(request.json))
         
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
     except Exception as e:
         return jsonify({
             'success': False,
@@ -770,94 +899,196 @@ def transform_non_circular():
 
 @app.route('/transform_atomic', methods=['POST'])
 def transform_atomic():
+    try:
+        return encode_result(run_transform_atomic(request.json))
+        
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/query', methods=['POST'])
+def query():
+    """
+    Arguments d'une revendication ('claim') et attaques qui la concernent,
+    construits en arrière sans énumérer tout le cadre (voir
+    ABAFramework.query_claim)
+    """
+    try:
+        return encode_result(run_query(request.json))
+        
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/assumption_attacks', methods=['POST'])
+def assumption_attacks():
+    """
+    Attaques ABA+ entre ensembles minimaux d'assomptions (voir
+    ABAFramework.compute_assumption_attacks), utilisables lorsque la vue par
+    arguments est trop grande pour être calculée
+    """
     try:
         aba_text = request.json.get('aba_text', '')
+        budget = ComputationBudget.from_options(request.json.get('budget'))
         
         # Parse input
         aba_original = parse_aba_input(aba_text)
         
-        # Apply atomic conversion directly (even if circular)
-        aba_atomic = aba_original.convert_to_atomic()
-        
-        # Generate arguments
-        arguments = aba_atomic.generate_arguments_optimized()
-        
-        # Compute attacks
-        attacks = aba_atomic.compute_all_attacks(arguments)
-        
-        # Format transformation info for atomic conversion
-        transformation_info = {
-            'transformation_type': 'atomic',
-            'original_language_size': len(aba_original.language),
-            'atomic_language_size': len(aba_atomic.language),
-            'original_assumptions_count': len(aba_original.assumptions),
-            'atomic_assumptions_count': len(aba_atomic.assumptions),
-            'original_rules_count': len(aba_original.rules),
-            'atomic_rules_count': len(aba_atomic.rules),
-            'new_assumptions': list(aba_atomic.assumptions - aba_original.assumptions)
-        }
-        
-        # Format atomic framework info
-        atomic_framework = {
-            'language': list(aba_atomic.language),
-            'assumptions': list(aba_atomic.assumptions),
-            'contraries': aba_atomic.contraries,
-            'rules_count': len(aba_atomic.rules),
-            'rules': [{
-                'name': rule['name'],
-                'conclusion': rule['conclusion'],
-                'premises': rule['premises']
-            } for rule in aba_atomic.rules]
-        }
+        # Minimal supports and set-level attacks (cached, unless partial)
+        attacks = RESULT_CACHE.get_or_compute(
+            ('assumption_attacks', aba_original.canonical_key()),
+            lambda: aba_original.compute_assumption_attacks(budget),
+            cacheable=lambda: not budget.partial)
         
         # Format response
         result = {
             'success': True,
-            'transformation_type': 'atomic',
-            'is_circular': aba_original.is_circular(),  # Keep original circularity status
-            'arguments': [
-                {
-                    'id': i,
-                    'conclusion': conc,
-                    'support': list(supp)
-                }
-                for i, (conc, supp) in enumerate(arguments)
-            ],
+            'is_circular': aba_original.is_circular(),
+            'minimal_supports': {
+                contrary: [sorted(support) for support in supports]
+                for contrary, supports in attacks['minimal_supports'].items()
+            },
             'attacks': {
-                'standard': len(attacks['standard']),
                 'normal': len(attacks['normal']),
                 'reverse': len(attacks['reverse']),
-                'total_aba_plus': len(attacks['all_aba_plus'])
+                'total_aba_plus': len(attacks['normal']) + len(attacks['reverse'])
             },
             'attack_details': {
-                'standard': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['standard']],
-                'normal': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['normal']],
-                'reverse': [{'description': a['description'], 'from': a['from'], 'to': a['to']} for a in attacks['reverse']]
-            },
-            'framework_info': {
-                'original_language': list(aba_original.language),
-                'original_assumptions': list(aba_original.assumptions),
-                'original_contraries': aba_original.contraries,
-                'preferences': aba_original.preferences,
-                'original_rules': [{
-                    'name': rule['name'],
-                    'conclusion': rule['conclusion'],
-                    'premises': rule['premises']
-                } for rule in aba_original.rules]
+                'normal': attacks['normal'],
+                'reverse': attacks['reverse']
             },
-            'atomic_framework': atomic_framework,
-            'transformation_info': transformation_info
+            'framework_info': format_framework_info(aba_original)
         }
+        if budget.partial:
+            result['partial'] = True
+        if 'budget' in request.json or budget.partial:
+            result['budget'] = budget.report()
         
-        return jsonify(result)
+        return encode_result(result)
         
+    except BudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Soumet une évaluation asynchrone : mêmes données que la route
+    synchrone correspondante, plus 'operation' ('process' par défaut,
+    'query', 'transform_atomic' ou 'transform_non_circular')
+    """
+    try:
+        data = dict(request.json)
+        operation = data.pop('operation', 'process')
+        data.pop('session_id', None)  # Pas de session pour les tâches
+        job = JOB_MANAGER.submit(operation, data)
+        return jsonify({'success': True, 'job': job}), 202
+    except JobQueueFull as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    try:
+        job = JOB_MANAGER.get(job_id)
+    except JobElsewhere as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    if job is None:
+        return jsonify({'success': False, 'error': "Tâche inconnue"}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """
+    Retourne le résultat d'une tâche terminée (même format que la route
+    synchrone)
+    """
+    try:
+        job, result = JOB_MANAGER.result(job_id)
+    except JobElsewhere as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    if job is None:
+        return jsonify({'success': False, 'error': "Tâche inconnue"}), 404
+    if job['status'] == 'done':
+        return encode_result(result)
+    if job['status'] in ('failed', 'timeout'):
+        return jsonify({'success': False, 'error': job['error'], 'job': job}), 400
+    if job['status'] == 'cancelled':
+        return jsonify({'success': False, 'error': "Tâche annulée", 'job': job}), 410
+    return jsonify({'success': False, 'error': "Tâche non terminée", 'job': job}), 409
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    try:
+        job = JOB_MANAGER.cancel(job_id)
+    except JobElsewhere as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    if job is None:
+        return jsonify({'success': False, 'error': "Tâche inconnue"}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(RESULT_CACHE.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Métriques au format texte de Prometheus : durée des étapes de calcul
+    (aba_stage_duration_seconds), éléments traités (aba_stage_items_total),
+    requêtes, état du cache et du stockage persistant
+    """
+    cache = RESULT_CACHE.stats()
+    extra = [
+        ('aba_cache_entries', 'gauge', "Entrées du cache de résultats", cache['entries']),
+        ('aba_cache_bytes', 'gauge', "Taille estimée du cache de résultats", cache['bytes']),
+        ('aba_cache_hits_total', 'counter', "Lectures réussies dans le cache de résultats", cache['hits']),
+        ('aba_cache_misses_total', 'counter', "Lectures manquées dans le cache de résultats", cache['misses']),
+        ('aba_cache_evictions_total', 'counter', "Entrées évincées du cache de résultats", cache['evictions'])
+    ]
+    store = cache['store']
+    if store is not None:
+        # Stockage persistant : taille commune, compteurs propres au processus
+        extra += [
+            ('aba_store_entries', 'gauge', "Entrées du stockage persistant", store['entries'] or 0),
+            ('aba_store_bytes', 'gauge', "Taille du stockage persistant", store['bytes'] or 0),
+            ('aba_store_hits_total', 'counter', "Lectures réussies dans le stockage persistant", store['hits']),
+            ('aba_store_misses_total', 'counter', "Lectures manquées dans le stockage persistant", store['misses']),
+            ('aba_store_writes_total', 'counter', "Entrées écrites dans le stockage persistant", store['writes']),
+            ('aba_store_evictions_total', 'counter', "Entrées évincées du stockage persistant", store['evictions']),
+            ('aba_store_errors_total', 'counter', "Erreurs d'accès au stockage persistant", store['errors'])
+        ]
+    return Response(METRICS.render(extra), mimetype='text/plain; version=0.0.4')
+
 # CE DOIT ÊTRE LA DERNIÈRE LIGNE
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,6 @@
+"""
+Banc d'essai des étapes du pipeline ABA (analyse, conversion atomique,
+transformation non-circulaire, arguments, attaques)
+
+Utilisation : python -m benchmarks.run --help
+"""
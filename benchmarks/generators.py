@@ -0,0 +1,117 @@
+"""
+Générateurs de cadres ABA synthétiques, au format texte accepté par
+parse_aba_input
+
+Chaque générateur prend une taille et un générateur aléatoire
+(random.Random) et retourne le texte du cadre.
+"""
+
+
+def _framework_text(assumptions, others, contraries, rules, preferences=()):
+    """
+    Assemble le texte d'un cadre à partir de ses composants
+    """
+    lines = [
+        f"L: [{','.join(list(assumptions) + list(others))}]",
+        f"A: [{','.join(assumptions)}]"
+    ]
+    for assumption, contrary in contraries.items():
+        lines.append(f"C({assumption}): {contrary}")
+    for k, (conclusion, premises) in enumerate(rules):
+        lines.append(f"[r{k}]: {conclusion} <- {','.join(premises)}")
+    for better, worse in preferences:
+        lines.append(f"PREF: {better} > {worse}")
+    return '\n'.join(lines)
+
+
+def chain(size, rng):
+    """
+    Chaîne p0 <- a0, p1 <- p0,a1, ... : profondeur de dérivation égale à size
+    """
+    assumptions = [f"a{i}" for i in range(size)]
+    others = [f"p{i}" for i in range(size)]
+    contraries = {a: others[(i + 1) % size] for i, a in enumerate(assumptions)}
+    rules = [(others[0], [assumptions[0]])]
+    rules += [(others[i], [others[i - 1], assumptions[i]]) for i in range(1, size)]
+    return _framework_text(assumptions, others, contraries, rules)
+
+
+def fan_in(size, rng, width=8):
+    """
+    Règles à nombreuses prémisses : chaque conclusion a deux règles de
+    `width` prémisses tirées parmi les assomptions et les conclusions
+    précédentes
+    """
+    assumptions = [f"a{i}" for i in range(size)]
+    others = [f"p{i}" for i in range(size)]
+    contraries = {a: rng.choice(others) for a in assumptions}
+    rules = []
+    for i, conclusion in enumerate(others):
+        pool = assumptions + others[:i]
+        for _ in range(2):
+            rules.append((conclusion, rng.sample(pool, min(width, len(pool)))))
+    return _framework_text(assumptions, others, contraries, rules)
+
+
+def random_dag(size, rng, rules_per_symbol=3, max_premises=3):
+    """
+    Graphe de dépendance acyclique aléatoire : les prémisses d'une règle
+    sont des assomptions ou des conclusions d'indice inférieur
+    """
+    assumptions = [f"a{i}" for i in range(size)]
+    others = [f"p{i}" for i in range(size)]
+    contraries = {a: rng.choice(others + assumptions) for a in assumptions}
+    rules = []
+    for _ in range(rules_per_symbol * size):
+        i = rng.randrange(size)
+        pool = assumptions + others[:i]
+        rules.append((others[i], rng.sample(pool, rng.randint(0, min(max_premises, len(pool))))))
+    preferences = []
+    for _ in range(size // 4):
+        better, worse = sorted(rng.sample(range(size), 2))
+        preferences.append((assumptions[better], assumptions[worse]))
+    return _framework_text(assumptions, others, contraries, rules, preferences)
+
+
+def cyclic_scc(size, rng, component_size=4):
+    """
+    Composantes fortement connexes de `component_size` symboles reliées en
+    cycle, chacune alimentée par des assomptions et par la composante
+    précédente
+    """
+    components = max(1, size // component_size)
+    assumptions = [f"a{i}" for i in range(size)]
+    others = [f"p{c}_{k}" for c in range(components) for k in range(component_size)]
+    contraries = {a: rng.choice(others) for a in assumptions}
+    rules = []
+    for c in range(components):
+        members = others[c * component_size:(c + 1) * component_size]
+        for k, conclusion in enumerate(members):
+            rules.append((conclusion, [members[k - 1], rng.choice(assumptions)]))
+        rules.append((members[0], [rng.choice(assumptions)]))
+        if c > 0:
+            rules.append((members[0], [others[(c - 1) * component_size]]))
+    return _framework_text(assumptions, others, contraries, rules)
+
+
+def dense_preferences(size, rng):
+    """
+    Ordre de préférence total (chaîne a0 > a1 > ... ) sur un cadre de
+    dérivations courtes : fermeture transitive quadratique et nombreuses
+    attaques inverses
+    """
+    assumptions = [f"a{i}" for i in range(size)]
+    others = [f"p{i}" for i in range(size)]
+    contraries = {a: rng.choice(others) for a in assumptions}
+    rules = [(rng.choice(others), rng.sample(assumptions, min(2, size))) for _ in range(2 * size)]
+    preferences = [(assumptions[i], assumptions[i + 1]) for i in range(size - 1)]
+    return _framework_text(assumptions, others, contraries, rules, preferences)
+
+
+GENERATORS = {
+    'chain': chain,
+    'fan_in': fan_in,
+    'random_dag': random_dag,
+    'cyclic_scc': cyclic_scc,
+    'dense_preferences': dense_preferences
+}
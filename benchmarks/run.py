@@ -0,0 +1,208 @@
+"""
+Exécute le banc d'essai et compare (optionnellement) à une référence
+
+Exemples :
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --generators chain,random_dag --sizes 50,100
+    python -m benchmarks.run --baseline baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from aba_core import parse_aba_input
+from benchmarks.generators import GENERATORS
+
+STAGES = ('parse', 'atomic', 'non_circular', 'non_circular_atomic', 'arguments', 'attacks')
+
+
+def run_pipeline(text, mode, minimal, workers):
+    """
+    Exécute les étapes du pipeline sur un texte et retourne, pour chaque
+    étape, (fonction sans argument, compteurs). Chaque fonction rejoue son
+    étape à partir des résultats des étapes précédentes.
+    """
+    framework = parse_aba_input(text)
+    atomic = framework.convert_to_atomic()
+    transformed, transformed_atomic = framework.convert_to_non_circular_atomic(mode)
+    # Arguments et attaques sur le cadre atomique du cadre non-circulaire
+    evaluated = transformed_atomic if framework.is_circular() else atomic
+    arguments = evaluated.generate_arguments_optimized(minimal=minimal)
+    attacks = evaluated.compute_all_attacks(arguments, workers=workers)
+
+    return {
+        'parse': (lambda: parse_aba_input(text), {
+            'language': len(framework.language),
+            'assumptions': len(framework.assumptions),
+            'rules': len(framework.rules),
+            'preferences': len(framework.preferences)
+        }),
+        'atomic': (framework.convert_to_atomic, {
+            'language': len(atomic.language),
+            'rules': len(atomic.rules)
+        }),
+        'non_circular': (lambda: framework.convert_to_non_circular(mode), {
+            'language': len(transformed.language),
+            'rules': len(transformed.rules)
+        }),
+        'non_circular_atomic': (lambda: framework.convert_to_non_circular_atomic(mode), {
+            'language': len(transformed_atomic.language),
+            'rules': len(transformed_atomic.rules)
+        }),
+        'arguments': (lambda: evaluated.generate_arguments_optimized(minimal=minimal), {
+            'arguments': len(arguments)
+        }),
+        'attacks': (lambda: evaluated.compute_all_attacks(arguments, workers=workers), {
+            'standard': len(attacks['standard']),
+            'normal': len(attacks['normal']),
+            'reverse': len(attacks['reverse'])
+        })
+    }
+
+
+def measure(function, repeat):
+    """
+    Retourne (meilleur temps sur repeat exécutions, pic mémoire en octets
+    d'une exécution supplémentaire sous tracemalloc)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(generators, sizes, stages, repeat, seed, mode, minimal, workers):
+    """
+    Exécute le banc d'essai et retourne la liste des résultats
+    """
+    results = []
+    for name in generators:
+        for size in sizes:
+            text = GENERATORS[name](size, random.Random(seed))
+            pipeline = run_pipeline(text, mode, minimal, workers)
+            for stage in stages:
+                function, counts = pipeline[stage]
+                elapsed, peak = measure(function, repeat)
+                results.append({
+                    'generator': name,
+                    'size': size,
+                    'stage': stage,
+                    'time_s': elapsed,
+                    'peak_bytes': peak,
+                    'counts': counts
+                })
+                print(f"{name:>18} {size:>6} {stage:>19} {elapsed * 1000:>10.2f} ms "
+                      f"{peak / 1024:>10.0f} Kio  {counts}")
+    return results
+
+
+def compare(results, baseline, tolerance, min_time):
+    """
+    Compare les résultats à une référence et retourne la liste des
+    régressions (temps ou mémoire supérieurs de plus de tolerance, en
+    ignorant les temps inférieurs à min_time), ainsi que les changements de
+    compteurs (résultats différents)
+    """
+    reference = {
+        (r['generator'], r['size'], r['stage']): r for r in baseline['results']
+    }
+    regressions = []
+    for result in results:
+        key = (result['generator'], result['size'], result['stage'])
+        previous = reference.get(key)
+        if previous is None:
+            continue
+        label = '/'.join(str(part) for part in key)
+        if result['counts'] != previous['counts']:
+            regressions.append(f"{label} : compteurs {previous['counts']} -> {result['counts']}")
+        if (result['time_s'] > previous['time_s'] * (1 + tolerance)
+                and result['time_s'] - previous['time_s'] > min_time):
+            regressions.append(
+                f"{label} : temps {previous['time_s'] * 1000:.2f} ms -> {result['time_s'] * 1000:.2f} ms"
+            )
+        if result['peak_bytes'] > previous['peak_bytes'] * (1 + tolerance) + 64 * 1024:
+            regressions.append(
+                f"{label} : mémoire {previous['peak_bytes']} -> {result['peak_bytes']} octets"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du pipeline ABA")
+    parser.add_argument('--generators', default=','.join(GENERATORS),
+                        help="générateurs, séparés par des virgules")
+    parser.add_argument('--sizes', default='50,200,800', help="tailles, séparées par des virgules")
+    parser.add_argument('--stages', default=','.join(STAGES), help="étapes, séparées par des virgules")
+    parser.add_argument('--repeat', type=int, default=3, help="exécutions chronométrées par étape")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mode', default='scc', choices=('full', 'scc'),
+                        help="mode de transformation non-circulaire")
+    parser.add_argument('--minimal', action='store_true', help="arguments de support minimal")
+    parser.add_argument('--workers', type=int, default=1, help="processus pour le calcul des attaques")
+    parser.add_argument('--output', help="fichier JSON des résultats")
+    parser.add_argument('--baseline', help="fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="dégradation relative tolérée (0.2 = 20 %%)")
+    parser.add_argument('--min-time', type=float, default=0.001,
+                        help="écart de temps minimal (s) pour signaler une régression")
+    args = parser.parse_args(argv)
+
+    generators = [name for name in args.generators.split(',') if name]
+    stages = [stage for stage in args.stages.split(',') if stage]
+    for name in generators:
+        if name not in GENERATORS:
+            parser.error(f"générateur inconnu : {name}")
+    for stage in stages:
+        if stage not in STAGES:
+            parser.error(f"étape inconnue : {stage}")
+
+    results = run_benchmarks(
+        generators, [int(size) for size in args.sizes.split(',')], stages,
+        args.repeat, args.seed, args.mode, args.minimal, args.workers
+    )
+    report = {
+        'metadata': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': args.seed,
+            'mode': args.mode,
+            'minimal': args.minimal,
+            'workers': args.workers
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_time)
+        if regressions:
+            print("\nRégressions par rapport à la référence :")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nAucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())